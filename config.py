@@ -3,6 +3,7 @@ Configuration settings for Gas Station Recommendation App
 """
 
 import os
+import tempfile
 from typing import Optional
 from pathlib import Path
 
@@ -51,9 +52,76 @@ class Config:
     LLM_MODEL: str = "claude-3-5-haiku-20241022"  # Updated to haiku model
     MAX_TOKENS: int = 1000
     TEMPERATURE: float = 0.1
+    ANALYSIS_WORKERS: int = int(os.getenv('ANALYSIS_WORKERS', '4'))  # Background LLM analysis threads
+    ANALYSIS_JOB_TTL_SECONDS: int = int(os.getenv('ANALYSIS_JOB_TTL_SECONDS', '600'))
+    ANALYSIS_MAX_JOBS: int = int(os.getenv('ANALYSIS_MAX_JOBS', '1000'))
+    ANALYSIS_SYNC_WAIT_SECONDS: float = float(os.getenv('ANALYSIS_SYNC_WAIT_SECONDS', '30'))  # Legacy in-response analysis wait
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv('LLM_CACHE_TTL_SECONDS', '900'))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '2000'))
+    LLM_CACHE_DIR: Optional[str] = os.getenv('LLM_CACHE_DIR')  # Persist analyses to disk if set
     
     # Map service settings
     MAP_PROVIDER: str = "google"  # or "openstreetmap" for fallback
+    PRICE_LOOKUP_WORKERS: int = int(os.getenv('PRICE_LOOKUP_WORKERS', '8'))  # Concurrent price lookups per search
+    STATION_TILE_SIZE_DEG: float = float(os.getenv('STATION_TILE_SIZE_DEG', '0.01'))  # ~0.7 mile grid
+    STATION_TILE_CACHE_TTL_SECONDS: int = int(os.getenv('STATION_TILE_CACHE_TTL_SECONDS', '900'))
+    STATION_TILE_CACHE_MAX_TILES: int = int(os.getenv('STATION_TILE_CACHE_MAX_TILES', '50000'))
+    STATION_CATALOG_PATH: Optional[str] = os.getenv('STATION_CATALOG_PATH')  # CSV/GeoJSON or compiled .stcat file
+    STATION_CATALOG_CELL_DEG: float = float(os.getenv('STATION_CATALOG_CELL_DEG', '0.02'))  # ~1.4 mile grid
+    STATION_CATALOG_COVERAGE_TTL_SECONDS: int = int(os.getenv('STATION_CATALOG_COVERAGE_TTL_SECONDS', '604800'))
+    PLACES_MIN_SUBQUERY_RADIUS_MILES: float = float(os.getenv('PLACES_MIN_SUBQUERY_RADIUS_MILES', '0.5'))  # Smallest split
+    PLACES_MAX_SUBQUERIES: int = int(os.getenv('PLACES_MAX_SUBQUERIES', '150'))  # nearbysearch circles per search
+    PLACES_SUBQUERY_WORKERS: int = int(os.getenv('PLACES_SUBQUERY_WORKERS', '8'))  # Concurrent page requests (pool shared by all searches)
+    PLACES_MAX_PAGES: int = int(os.getenv('PLACES_MAX_PAGES', '3'))  # Google serves at most 3 pages of 20
+    PLACES_PAGE_TOKEN_DELAY_SECONDS: float = float(os.getenv('PLACES_PAGE_TOKEN_DELAY_SECONDS', '2.0'))
+    ADAPTIVE_SEARCH: bool = os.getenv('ADAPTIVE_SEARCH', 'false').lower() == 'true'  # Grow the radius until enough stations
+    ADAPTIVE_START_RADIUS_MILES: float = float(os.getenv('ADAPTIVE_START_RADIUS_MILES', '1.0'))
+    ADAPTIVE_GROWTH_FACTOR: float = float(os.getenv('ADAPTIVE_GROWTH_FACTOR', '2.0'))
+    ADAPTIVE_TARGET_STATIONS: int = int(os.getenv('ADAPTIVE_TARGET_STATIONS', '10'))  # Viable stations to stop at
+    LAZY_STATION_DETAILS: bool = os.getenv('LAZY_STATION_DETAILS', 'false').lower() == 'true'  # Price on click, not per search
+    STATION_DETAILS_TTL_SECONDS: int = int(os.getenv('STATION_DETAILS_TTL_SECONDS', '3600'))
+    STATION_DETAILS_MAX_ENTRIES: int = int(os.getenv('STATION_DETAILS_MAX_ENTRIES', '5000'))
+    STATION_CATALOG_RELOAD_SECONDS: int = int(os.getenv('STATION_CATALOG_RELOAD_SECONDS', '30'))  # Check for a rebuilt .stcat
+    
+    # Price cache settings
+    PRICE_CACHE_TTL_SECONDS: int = int(os.getenv('PRICE_CACHE_TTL_SECONDS', '3600'))  # 1 hour
+    PRICE_CACHE_STALE_SECONDS: int = int(os.getenv('PRICE_CACHE_STALE_SECONDS', '1800'))  # Serve stale while refreshing
+    PRICE_CACHE_MAX_ENTRIES: int = int(os.getenv('PRICE_CACHE_MAX_ENTRIES', '5000'))
+    PLACE_ID_CACHE_TTL_SECONDS: int = int(os.getenv('PLACE_ID_CACHE_TTL_SECONDS', '604800'))  # Location -> place_id
+    PLACE_ID_CACHE_MAX_ENTRIES: int = int(os.getenv('PLACE_ID_CACHE_MAX_ENTRIES', '50000'))
+    PRICE_REFRESH_WORKERS: int = int(os.getenv('PRICE_REFRESH_WORKERS', '2'))  # Background refresh threads
+    
+    # Outbound HTTP settings (shared keep-alive pools, one per host)
+    HTTP_POOL_SIZE: int = int(os.getenv('HTTP_POOL_SIZE', '20'))
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv('HTTP_TIMEOUT_SECONDS', '10'))
+    HTTP_MAX_RETRIES: int = int(os.getenv('HTTP_MAX_RETRIES', '2'))  # Idempotent requests only
+    HTTP_BACKOFF_FACTOR: float = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.3'))
+    
+    # Result store settings (raw search results kept for re-ranking and paging)
+    RESULT_STORE_TTL_SECONDS: int = int(os.getenv('RESULT_STORE_TTL_SECONDS', '900'))
+    RESULT_STORE_MAX_ENTRIES: int = int(os.getenv('RESULT_STORE_MAX_ENTRIES', '500'))
+    MAX_PAGE_SIZE: int = int(os.getenv('MAX_PAGE_SIZE', '100'))  # Largest station page a client can request
+    
+    # API response settings
+    RESPONSE_COMPRESS_MIN_BYTES: int = int(os.getenv('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+    RESPONSE_GZIP_LEVEL: int = int(os.getenv('RESPONSE_GZIP_LEVEL', '6'))
+    RESPONSE_BROTLI_QUALITY: int = int(os.getenv('RESPONSE_BROTLI_QUALITY', '5'))  # Used if brotli is installed
+    
+    # Geocoding settings
+    GEOCODE_DEADLINE_SECONDS: float = float(os.getenv('GEOCODE_DEADLINE_SECONDS', '3.0'))  # Worst-case geocode time
+    GEOCODE_HEDGE_DELAY_SECONDS: float = float(os.getenv('GEOCODE_HEDGE_DELAY_SECONDS', '0.5'))  # Google head start
+    GEOCODE_REQUEST_TIMEOUT_SECONDS: float = float(os.getenv('GEOCODE_REQUEST_TIMEOUT_SECONDS', '2.0'))  # Per provider call
+    GEOCODE_CACHE_PATH: str = os.getenv(
+        'GEOCODE_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'gas-station-geocode-cache.sqlite3')
+    )  # Shared SQLite cache; empty keeps it in memory
+    GEOCODE_CACHE_TTL_SECONDS: int = int(os.getenv('GEOCODE_CACHE_TTL_SECONDS', '2592000'))  # 30 days
+    GEOCODE_NEGATIVE_TTL_SECONDS: int = int(os.getenv('GEOCODE_NEGATIVE_TTL_SECONDS', '600'))  # Failed lookups
+    GEOCODE_CACHE_MAX_ENTRIES: int = int(os.getenv('GEOCODE_CACHE_MAX_ENTRIES', '100000'))
+    REVERSE_GEOCODE_GRID_METERS: float = float(os.getenv('REVERSE_GEOCODE_GRID_METERS', '25'))  # Cache cell size
+    REVERSE_GEOCODE_CACHE_MAX_ENTRIES: int = int(os.getenv('REVERSE_GEOCODE_CACHE_MAX_ENTRIES', '200000'))
+    OFFLINE_GAZETTEER: bool = os.getenv('OFFLINE_GAZETTEER', 'true').lower() == 'true'  # Resolve "City, ST"/ZIP locally
+    GAZETTEER_EXTRA_PATH: Optional[str] = os.getenv('GAZETTEER_EXTRA_PATH')  # More place CSVs (os.pathsep separated)
+    NOMINATIM_MAX_REQUESTS_PER_SECOND: float = float(os.getenv('NOMINATIM_MAX_REQUESTS_PER_SECOND', '1.0'))  # Usage policy
     
     # Default location (San Francisco)
     DEFAULT_LATITUDE: float = 37.7749
@@ -9,11 +9,13 @@ from .schema import (
     RecommendationRequest,
     RecommendationResponse
 )
+from .station_batch import StationBatch
 
 __all__ = [
     'UserPreferences',
     'Location', 
     'GasStation',
     'RecommendationRequest',
-    'RecommendationResponse'
+    'RecommendationResponse',
+    'StationBatch'
 ] 
\ No newline at end of file
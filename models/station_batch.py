@@ -0,0 +1,159 @@
+"""
+Columnar station data for Gas Station Recommendation App
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Sequence, Union
+import numpy as np
+
+# Fuel grades always present as price columns
+FUEL_GRADES = ('87', '89', '91')
+
+@dataclass
+class StationBatch:
+    """
+    Struct-of-arrays view of a list of gas stations
+
+    Numeric fields live in NumPy arrays so filtering, costing and scoring run
+    as array operations. The original station dicts are kept alongside and
+    only touched again at the response boundary (to_dicts).
+    """
+    stations: List[Dict[str, Any]]
+    latitude: np.ndarray
+    longitude: np.ndarray
+    grades: List[str]
+    prices: np.ndarray  # (n, len(grades)); NaN where a grade has no price
+    price_per_gallon: np.ndarray
+    distance_miles: np.ndarray
+    travel_time_minutes: np.ndarray
+    rating: np.ndarray  # NaN where the station has no rating
+    brand: np.ndarray  # Lower-cased brand names
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)  # Computed per-station values
+    grade_columns: Dict[str, np.ndarray] = field(default_factory=dict)  # Computed (n, len(grades)) values
+
+    @classmethod
+    def from_dicts(cls, stations: List[Dict[str, Any]], grades: Sequence[str] = FUEL_GRADES) -> 'StationBatch':
+        """
+        Build a batch from station dicts
+
+        Args:
+            stations: Gas station data
+            grades: Fuel grades to hold price columns for (others found are appended)
+
+        Returns:
+            StationBatch: Columnar view of the stations
+        """
+        grades = list(grades)
+        for station in stations:
+            for grade in station.get('gas_prices') or {}:
+                if grade not in grades:
+                    grades.append(grade)
+
+        n = len(stations)
+        prices = np.full((n, len(grades)), np.nan)
+        grade_index = {grade: i for i, grade in enumerate(grades)}
+        for row, station in enumerate(stations):
+            for grade, price in (station.get('gas_prices') or {}).items():
+                if price is not None:
+                    prices[row, grade_index[grade]] = price
+
+        def column(key: str, default: float) -> np.ndarray:
+            values = [station.get(key, default) for station in stations]
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        return cls(
+            stations=stations,
+            latitude=np.array([s.get('location', {}).get('latitude', np.nan) for s in stations], dtype=np.float64),
+            longitude=np.array([s.get('location', {}).get('longitude', np.nan) for s in stations], dtype=np.float64),
+            grades=grades,
+            prices=prices,
+            price_per_gallon=column('price_per_gallon', 0),
+            distance_miles=column('distance_miles', np.inf),
+            travel_time_minutes=column('travel_time_minutes', np.inf),
+            rating=column('rating', np.nan),
+            brand=np.array([(s.get('brand') or '').lower() for s in stations], dtype=object)
+        )
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def price_for_grade(self, fuel_grade: str) -> np.ndarray:
+        """
+        Price per gallon for a grade, falling back to price_per_gallon
+
+        Args:
+            fuel_grade: Fuel grade ('87', '89', '91')
+
+        Returns:
+            np.ndarray: Price for each station
+        """
+        fallback = np.nan_to_num(self.price_per_gallon, nan=0.0)
+        if fuel_grade not in self.grades:
+            return fallback
+        grade_prices = self.prices[:, self.grades.index(fuel_grade)]
+        return np.where(np.isnan(grade_prices), fallback, grade_prices)
+
+    def price_matrix(self) -> np.ndarray:
+        """
+        Price per gallon for every grade, with the same fallback as price_for_grade
+
+        Returns:
+            np.ndarray: (n, len(grades)) prices
+        """
+        fallback = np.nan_to_num(self.price_per_gallon, nan=0.0)
+        return np.where(np.isnan(self.prices), fallback[:, np.newaxis], self.prices)
+
+    def select(self, index: Union[np.ndarray, List[int]]) -> 'StationBatch':
+        """
+        Take a subset or reordering of the batch
+
+        Args:
+            index: Boolean mask or integer indices
+
+        Returns:
+            StationBatch: New batch sharing the underlying station dicts
+        """
+        index = np.asarray(index)
+        positions = np.flatnonzero(index) if index.dtype == bool else index
+        return StationBatch(
+            stations=[self.stations[i] for i in positions],
+            latitude=self.latitude[positions],
+            longitude=self.longitude[positions],
+            grades=self.grades,
+            prices=self.prices[positions],
+            price_per_gallon=self.price_per_gallon[positions],
+            distance_miles=self.distance_miles[positions],
+            travel_time_minutes=self.travel_time_minutes[positions],
+            rating=self.rating[positions],
+            brand=self.brand[positions],
+            columns={name: values[positions] for name, values in self.columns.items()},
+            grade_columns={name: values[positions] for name, values in self.grade_columns.items()}
+        )
+
+    def to_dicts(self, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Write computed columns back into the station dicts
+
+        Grade columns are written as one costs_by_grade dict per station:
+        {grade: {column: value}}.
+
+        Args:
+            columns: Computed columns to write (default: all)
+
+        Returns:
+            List[Dict]: The station dicts, in batch order
+        """
+        names = list(self.columns) if columns is None else list(columns)
+        values = {name: self.columns[name].tolist() for name in names}
+        for row, station in enumerate(self.stations):
+            for name in names:
+                station[name] = values[name][row]
+
+        if self.grade_columns:
+            grade_values = {name: matrix.tolist() for name, matrix in self.grade_columns.items()}
+            for row, station in enumerate(self.stations):
+                station['costs_by_grade'] = {
+                    grade: {name: matrix[row][i] for name, matrix in grade_values.items()}
+                    for i, grade in enumerate(self.grades)
+                }
+        return self.stations
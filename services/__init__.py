@@ -3,7 +3,7 @@ Services package for Gas Station Recommendation App
 """
 
 from .fuel_calculator import calculate_gas_needed, calculate_range, validate_fuel_input
-from .location_service import geocode_address, use_current_location, reverse_geocode
+from .location_service import geocode_address, use_current_location, reverse_geocode, reverse_geocode_batch
 from .map_service import search_gas_stations, get_directions
 from .gas_filter import filter_stations, calculate_station_costs, get_station_summary
 from .llm_service import analyze_with_llm, summarize_stations, get_quick_recommendation
@@ -15,6 +15,7 @@ __all__ = [
     'geocode_address',
     'use_current_location',
     'reverse_geocode',
+    'reverse_geocode_batch',
     'search_gas_stations',
     'get_directions',
     'filter_stations',
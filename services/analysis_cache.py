@@ -0,0 +1,143 @@
+"""
+Content-addressed cache for LLM analyses in Gas Station Recommendation App
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from config import Config
+from utils.cache import TTLCache
+
+# Stations included in an analysis prompt (see LLMService._format_station_data)
+ANALYZED_STATIONS = 10
+
+def analysis_cache_key(stations: List[Dict[str, Any]], fuel_grade: str, provider: str,
+                       fuel_needed: Optional[float] = None, mpg: Optional[float] = None) -> str:
+    """
+    Compute the content hash identifying an analysis
+
+    Only inputs that change the recommendation are hashed: the analyzed
+    stations in order (by place_id), their prices and fuel cost rounded to
+    the cent, the user's fuel needed and mpg rounded to a tenth, the fuel
+    grade and the provider/model. The user's exact distance, and so the
+    travel and total cost, is ignored, so neighbors searching the same
+    stations share one analysis.
+
+    Args:
+        stations: Stations passed to the analysis
+        fuel_grade: Fuel grade to consider (87, 89, 91)
+        provider: Provider and model that will produce the analysis
+        fuel_needed: Gallons the user needs
+        mpg: Miles per gallon of the user's car
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    canonical_stations = []
+    for station in stations[:ANALYZED_STATIONS]:
+        gas_prices = station.get('gas_prices', {})
+        selected_price = gas_prices.get(fuel_grade, station.get('price_per_gallon', 0))
+        canonical_stations.append([
+            station.get('place_id') or station.get('name', ''),
+            round(selected_price or 0, 2),
+            round(station.get('fuel_cost') or 0, 2),
+            sorted((grade, round(price, 2)) for grade, price in gas_prices.items() if price is not None)
+        ])
+
+    canonical = json.dumps(
+        {
+            'stations': canonical_stations,
+            'fuel_grade': fuel_grade,
+            'provider': provider,
+            'fuel_needed': None if fuel_needed is None else round(fuel_needed, 1),
+            'mpg': None if mpg is None else round(mpg, 1)
+        },
+        sort_keys=True, separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class AnalysisCache:
+    """In-memory LRU/TTL cache of analyses with optional on-disk persistence"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Args:
+            max_entries: Maximum analyses held in memory
+            ttl: Seconds an analysis stays valid
+            cache_dir: Directory for persisted analyses (disabled if empty)
+        """
+        self.ttl = ttl or Config.LLM_CACHE_TTL_SECONDS
+        self.memory = TTLCache(max_entries=max_entries or Config.LLM_CACHE_MAX_ENTRIES, ttl=self.ttl)
+        cache_dir = Config.LLM_CACHE_DIR if cache_dir is None else cache_dir
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached analysis
+
+        Args:
+            key: Content hash from analysis_cache_key()
+
+        Returns:
+            Optional[str]: The analysis text, or None on a miss
+        """
+        analysis = self.memory.get(key)
+        if analysis is not None or self.cache_dir is None:
+            return analysis
+
+        entry = self._read_file(key)
+        if entry is None:
+            return None
+
+        remaining = self.ttl - (time.time() - entry['created_at'])
+        if remaining <= 0:
+            return None
+
+        self.memory.set(key, entry['analysis'], ttl=remaining)
+        return entry['analysis']
+
+    def set(self, key: str, analysis: str) -> None:
+        """
+        Store an analysis in memory and, if enabled, on disk
+
+        Args:
+            key: Content hash from analysis_cache_key()
+            analysis: Analysis text
+        """
+        self.memory.set(key, analysis)
+        if self.cache_dir is not None:
+            self._write_file(key, {'created_at': time.time(), 'analysis': analysis})
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_file(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path_for(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️  Analysis cache read error: {e}")
+            return None
+
+    def _write_file(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️  Analysis cache write error: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters for the in-memory layer"""
+        return self.memory.stats()
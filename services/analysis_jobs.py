@@ -0,0 +1,156 @@
+"""
+Background LLM analysis jobs for Gas Station Recommendation App
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional
+from config import Config
+from utils.cache import TTLCache
+from .llm_service import llm_service
+
+class AnalysisJob:
+    """State of a single background analysis"""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    ERROR = 'error'
+
+    def __init__(self, job_id: str, fuel_grade: str):
+        self.job_id = job_id
+        self.fuel_grade = fuel_grade
+        self.status = self.PENDING
+        self.analysis: Optional[str] = None
+        self.error: Optional[str] = None
+        self.chunks: List[str] = []
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._changed = threading.Condition()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.DONE, self.ERROR)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns False on timeout"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.is_finished, timeout)
+
+    def append(self, chunk: str) -> None:
+        """Add a streamed piece of the analysis and wake up readers"""
+        with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    def finish(self, analysis: Optional[str] = None, error: Optional[str] = None) -> None:
+        """Record the outcome and wake up waiters"""
+        with self._changed:
+            self.analysis = analysis
+            self.error = error
+            self.status = self.ERROR if error else self.DONE
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def iter_chunks(self, heartbeat: Optional[float] = None) -> Iterator[Optional[str]]:
+        """
+        Follow the analysis as it is generated
+
+        Yields every chunk produced so far and then new ones as they arrive,
+        until the job finishes.
+
+        Args:
+            heartbeat: If set, yield None after this many idle seconds
+
+        Yields:
+            Optional[str]: Next chunk, or None as an idle heartbeat
+        """
+        sent = 0
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: len(self.chunks) > sent or self.is_finished, heartbeat)
+                pending = self.chunks[sent:]
+                finished = self.is_finished
+
+            if pending:
+                sent += len(pending)
+                yield from pending
+            elif finished:
+                return
+            else:
+                yield None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'fuel_grade': self.fuel_grade,
+            'analysis': self.analysis,
+            'error': self.error
+        }
+
+class AnalysisJobManager:
+    """Runs LLM analyses on a background worker pool and keeps their results"""
+
+    def __init__(self, max_workers: Optional[int] = None, ttl: Optional[float] = None,
+                 max_jobs: Optional[int] = None):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.ANALYSIS_WORKERS,
+            thread_name_prefix='llm-analysis'
+        )
+        self.jobs = TTLCache(
+            max_entries=max_jobs or Config.ANALYSIS_MAX_JOBS,
+            ttl=ttl or Config.ANALYSIS_JOB_TTL_SECONDS
+        )
+
+    def submit(self, stations: List[Dict[str, Any]], fuel_grade: str = "87",
+               fuel_needed: Optional[float] = None, mpg: Optional[float] = None) -> AnalysisJob:
+        """
+        Queue an LLM analysis of the given stations
+
+        Args:
+            stations: Gas station data to analyze
+            fuel_grade: Fuel grade to consider (87, 89, 91)
+            fuel_needed: Gallons the user needs
+            mpg: Miles per gallon of the user's car
+
+        Returns:
+            AnalysisJob: The queued job; its job_id can be polled with get()
+        """
+        job = AnalysisJob(uuid.uuid4().hex, fuel_grade)
+        self.jobs.set(job.job_id, job)
+
+        # Snapshot the stations so later changes by the caller don't leak in
+        snapshot = [dict(station) for station in stations]
+        self.executor.submit(self._run, job, snapshot, fuel_needed, mpg)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """
+        Look up a job
+
+        Args:
+            job_id: ID of a job returned by submit()
+
+        Returns:
+            Optional[AnalysisJob]: The job, or None if unknown or expired
+        """
+        return self.jobs.get(job_id)
+
+    def _run(self, job: AnalysisJob, stations: List[Dict[str, Any]],
+             fuel_needed: Optional[float] = None, mpg: Optional[float] = None) -> None:
+        """Worker body: stream the analysis into the job and record its outcome"""
+        job.status = AnalysisJob.RUNNING
+        try:
+            for chunk in llm_service.stream_analysis(stations, job.fuel_grade, fuel_needed, mpg):
+                job.append(chunk)
+            job.finish(analysis=''.join(job.chunks))
+        except Exception as e:
+            print(f"⚠️  Analysis job {job.job_id} failed: {e}")
+            job.finish(error=str(e))
+
+# Global instance
+analysis_jobs = AnalysisJobManager()
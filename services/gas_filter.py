@@ -2,15 +2,29 @@
 Gas station filtering service for Gas Station Recommendation App
 """
 
-from typing import List, Dict, Any, Optional
+import heapq
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+import numpy as np
 from models.schema import GasStation, Location
+from models.station_batch import StationBatch
 from config import Config
 
+# Major brands get a small ranking bonus
+MAJOR_BRANDS = ['shell', 'chevron', 'exxon', 'mobil', 'bp']
+
+# Criteria accepted by rank_by_criteria
+RANKING_CRITERIA = ('cost', 'distance', 'time', 'rating')
+
 def filter_stations(stations: List[Dict[str, Any]], gas_needed: float, mpg: float, 
-                   tank_remaining: float, speed: int = 40, fuel_grade: str = '87') -> List[Dict[str, Any]]:
+                   tank_remaining: float, speed: int = 40, fuel_grade: str = '87',
+                   top_k: Optional[int] = None, with_remainder: bool = False
+                   ) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], 'LazyRanking']]:
     """
     Filter gas stations based on range, time, and other criteria
     
+    Filtering, costing and scoring run on a columnar StationBatch; the
+    results are written back to the station dicts only at the end.
+    
     Args:
         stations: List of gas station data
         gas_needed: Amount of gas needed in gallons
@@ -18,11 +32,14 @@ def filter_stations(stations: List[Dict[str, Any]], gas_needed: float, mpg: floa
         tank_remaining: Remaining fuel in tank
         speed: Typical speed for time calculations (mph)
         fuel_grade: Fuel grade to use for price calculations ('87', '89', '91')
+        top_k: If set, only the best top_k stations are selected and sorted
+        with_remainder: Also return the other stations as a lazily sorted LazyRanking
         
     Returns:
-        List[Dict]: Filtered and ranked gas stations
+        List[Dict]: Filtered and ranked gas stations, or a (top stations,
+        remainder) tuple when with_remainder is set
     """
-    recommended = []
+    batch = StationBatch.from_dicts(stations)
     
     # Calculate maximum range based on remaining fuel
     max_range = tank_remaining * mpg
@@ -30,27 +47,157 @@ def filter_stations(stations: List[Dict[str, Any]], gas_needed: float, mpg: floa
     # Calculate maximum travel time (20 minutes)
     max_travel_time = Config.MAX_TRAVEL_TIME_MINUTES
     
-    for station in stations:
-        distance = station.get('distance_miles', float('inf'))
-        travel_time = station.get('travel_time_minutes', float('inf'))
+    # Keep stations within range
+    in_range = (batch.distance_miles <= max_range) & (batch.travel_time_minutes <= max_travel_time)
+    batch = batch.select(in_range)
+    
+    # Calculate costs using the selected fuel grade, then efficiency score
+    calculate_batch_costs(batch, gas_needed, mpg, fuel_grade)
+    scores = calculate_batch_efficiency_scores(batch)
+    
+    # Rank by efficiency score (higher is better)
+    if top_k is None or top_k >= len(batch):
+        order = np.argsort(-scores, kind='stable')
+    else:
+        order = _top_k_indices(-scores, top_k)
+    
+    ranked = batch.select(order).to_dicts()
+    if not with_remainder:
+        return ranked
+    
+    rest = np.setdiff1d(np.arange(len(batch)), order, assume_unique=True)
+    rest_stations = batch.select(rest).to_dicts()
+    remainder = LazyRanking(rest_stations, keys=zip((-scores[rest]).tolist(), rest.tolist()))
+    return ranked, remainder
+
+def _top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k smallest values, in the order a stable sort would give
+    
+    Uses partial selection (O(n)) and only sorts the k selected values.
+    Ties at the cut-off keep the earliest positions, as a stable sort would.
+    """
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    
+    kth_value = np.partition(values, k - 1)[k - 1]
+    below = np.flatnonzero(values < kth_value)
+    ties = np.flatnonzero(values == kth_value)[:k - len(below)]
+    selected = np.concatenate([below, ties])
+    return selected[np.lexsort((selected, values[selected]))]
+
+class LazyRanking:
+    """
+    Stations in rank order, sorted lazily
+    
+    Building the ranking is O(n); each station taken costs O(log n), so
+    callers that only read the next page never pay for a full sort.
+    """
+    
+    def __init__(self, stations: Iterable[Dict[str, Any]], keys: Iterable[Any]):
+        """
+        Args:
+            stations: Stations to rank
+            keys: Sort key per station (smaller ranks first)
+        """
+        self._heap = [(key, position, station)
+                      for position, (key, station) in enumerate(zip(keys, stations))]
+        heapq.heapify(self._heap)
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        if not self._heap:
+            raise StopIteration
+        return heapq.heappop(self._heap)[2]
+    
+    def take(self, n: int) -> List[Dict[str, Any]]:
+        """Remove and return the next n stations in rank order"""
+        return [next(self) for _ in range(min(n, len(self._heap)))]
+
+def calculate_batch_costs(batch: StationBatch, gas_needed: float, mpg: float, fuel_grade: str = '87') -> StationBatch:
+    """
+    Calculate total costs for every station in a batch
+    
+    Vectorized counterpart of calculate_station_costs. Adds the fuel_cost,
+    travel_cost, total_cost and cost_per_gallon_effective columns for the
+    selected grade, and the same values (plus price_per_gallon) for every
+    grade as grade columns, so clients can switch grades without a new search.
+    
+    Args:
+        batch: Columnar station data
+        gas_needed: Amount of gas needed in gallons
+        mpg: Miles per gallon of the car
+        fuel_grade: Fuel grade to use for price calculations ('87', '89', '91')
         
-        # Check if station is within range
-        if distance <= max_range and travel_time <= max_travel_time:
-            # Calculate costs using the selected fuel grade
-            costs = calculate_station_costs(station, gas_needed, mpg, fuel_grade)
-            
-            # Add calculated costs to station data
-            station.update(costs)
-            
-            # Add efficiency score
-            station['efficiency_score'] = calculate_efficiency_score(station, gas_needed, mpg)
-            
-            recommended.append(station)
-    
-    # Sort by efficiency score (higher is better)
-    recommended.sort(key=lambda x: x.get('efficiency_score', 0), reverse=True)
-    
-    return recommended
+    Returns:
+        StationBatch: The same batch with cost columns added
+    """
+    prices = batch.price_matrix()  # (n, grades)
+    distance = np.nan_to_num(batch.distance_miles, nan=0.0)
+    travel_gallons = (distance * 2) / mpg  # Round trip
+    
+    fuel_cost = gas_needed * prices
+    travel_cost = travel_gallons[:, np.newaxis] * prices
+    total_cost = fuel_cost + travel_cost
+    
+    batch.grade_columns['price_per_gallon'] = prices
+    batch.grade_columns['fuel_cost'] = np.round(fuel_cost, 2)
+    batch.grade_columns['travel_cost'] = np.round(travel_cost, 2)
+    batch.grade_columns['total_cost'] = np.round(total_cost, 2)
+    batch.grade_columns['cost_per_gallon_effective'] = np.round(total_cost / gas_needed, 2)
+    
+    if fuel_grade in batch.grades:
+        selected = batch.grades.index(fuel_grade)
+        for name in ('fuel_cost', 'travel_cost', 'total_cost', 'cost_per_gallon_effective'):
+            batch.columns[name] = batch.grade_columns[name][:, selected]
+    else:
+        price_per_gallon = batch.price_for_grade(fuel_grade)
+        fuel_cost = gas_needed * price_per_gallon
+        travel_cost = travel_gallons * price_per_gallon
+        total_cost = fuel_cost + travel_cost
+        batch.columns['fuel_cost'] = np.round(fuel_cost, 2)
+        batch.columns['travel_cost'] = np.round(travel_cost, 2)
+        batch.columns['total_cost'] = np.round(total_cost, 2)
+        batch.columns['cost_per_gallon_effective'] = np.round(total_cost / gas_needed, 2)
+    return batch
+
+def calculate_batch_efficiency_scores(batch: StationBatch) -> np.ndarray:
+    """
+    Calculate efficiency scores for every station in a batch
+    
+    Vectorized counterpart of calculate_efficiency_score; expects the cost
+    columns from calculate_batch_costs. Adds the efficiency_score column,
+    and an efficiency_score grade column when per-grade costs are present.
+    
+    Args:
+        batch: Columnar station data with cost columns
+        
+    Returns:
+        np.ndarray: Efficiency score per station (higher is better)
+    """
+    distance_penalty = np.nan_to_num(batch.distance_miles, nan=0.0) * 10
+    time_penalty = np.nan_to_num(batch.travel_time_minutes, nan=0.0) * 2
+    
+    # Stations without ratings get no bonus
+    rating_bonus = np.nan_to_num((batch.rating - 3.0) * 50, nan=0.0)
+    brand_bonus = np.isin(batch.brand, MAJOR_BRANDS) * 20
+    
+    def score(total_cost: np.ndarray) -> np.ndarray:
+        cost_score = 1000 / (total_cost + 1)
+        return np.maximum(0, cost_score - distance_penalty - time_penalty + rating_bonus + brand_bonus)
+    
+    scores = score(batch.columns['total_cost'])
+    batch.columns['efficiency_score'] = scores
+    if 'total_cost' in batch.grade_columns:
+        batch.grade_columns['efficiency_score'] = np.column_stack([
+            score(batch.grade_columns['total_cost'][:, i]) for i in range(len(batch.grades))
+        ])
+    return scores
 
 def calculate_station_costs(station: Dict[str, Any], gas_needed: float, mpg: float, fuel_grade: str = '87') -> Dict[str, float]:
     """
@@ -121,7 +268,7 @@ def calculate_efficiency_score(station: Dict[str, Any], gas_needed: float, mpg:
     # Brand preference (major brands get small bonus)
     brand = station.get('brand', '').lower()
     brand_bonus = 0
-    if brand in ['shell', 'chevron', 'exxon', 'mobil', 'bp']:
+    if brand in MAJOR_BRANDS:
         brand_bonus = 20
     
     final_score = cost_score - distance_penalty - time_penalty + rating_bonus + brand_bonus
@@ -224,24 +371,45 @@ def get_station_summary(stations: List[Dict[str, Any]]) -> Dict[str, Any]:
         'avg_travel_time': round(sum(travel_times) / len(travel_times), 0)
     }
 
-def rank_by_criteria(stations: List[Dict[str, Any]], criteria: str = 'cost') -> List[Dict[str, Any]]:
+def rank_by_criteria(stations: List[Dict[str, Any]], criteria: str = 'cost', k: Optional[int] = None,
+                     with_remainder: bool = False
+                     ) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], LazyRanking]]:
     """
     Rank stations by different criteria
     
     Args:
         stations: List of gas station data
         criteria: Ranking criteria ('cost', 'distance', 'time', 'rating')
+        k: If set, only the best k stations are selected (heap, O(n log k))
+        with_remainder: Also return the other stations as a lazily sorted LazyRanking
         
     Returns:
-        List[Dict]: Ranked stations
+        List[Dict]: Ranked stations, or a (top stations, remainder) tuple
+        when with_remainder is set
     """
     if criteria == 'cost':
-        return sorted(stations, key=lambda x: x.get('total_cost', float('inf')))
+        key = lambda x: x.get('total_cost', float('inf'))
     elif criteria == 'distance':
-        return sorted(stations, key=lambda x: x.get('distance_miles', float('inf')))
+        key = lambda x: x.get('distance_miles', float('inf'))
     elif criteria == 'time':
-        return sorted(stations, key=lambda x: x.get('travel_time_minutes', float('inf')))
+        key = lambda x: x.get('travel_time_minutes', float('inf'))
     elif criteria == 'rating':
-        return sorted(stations, key=lambda x: x.get('rating', 0), reverse=True)
+        key = lambda x: -(x.get('rating') or 0)  # Higher rating first; unrated (None) last
+    else:
+        key = None  # Keep input order for unknown criteria
+    
+    if key is None:
+        ranked = list(stations) if k is None else list(stations[:k])
+    elif k is None or k >= len(stations):
+        ranked = sorted(stations, key=key)
     else:
-        return stations  # Return as-is for unknown criteria 
\ No newline at end of file
+        # heapq.nsmallest is equivalent to sorted(...)[:k], including ties
+        ranked = heapq.nsmallest(k, stations, key=key)
+    
+    if not with_remainder:
+        return ranked
+    
+    chosen = {id(station) for station in ranked}
+    rest = [station for station in stations if id(station) not in chosen]
+    keys = [0] * len(rest) if key is None else [key(station) for station in rest]
+    return ranked, LazyRanking(rest, keys)
@@ -2,19 +2,52 @@
 Gas Price Service for Gas Station Recommendation App
 """
 
-import requests
 import random
+import threading
 import time
-from typing import Dict, Optional, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any
 from config import Config
+from utils.http_client import http_client
+from utils.cache import TTLCache
+from utils.concurrency import bounded_map
+from utils.geo import haversine_miles
+from utils.singleflight import single_flight
+
+# Fuel grades cached per station
+FUEL_GRADES = ('87', '89', '91')
+
+# Regular (87) price by Google price level (0-4 scale) - Updated for 2024
+PRICE_LEVEL_BASE_PRICES = {
+    0: 3.80,  # Very cheap
+    1: 4.10,  # Cheap
+    2: 4.40,  # Moderate
+    3: 4.80,  # Expensive
+    4: 5.20   # Very expensive
+}
 
 class GasPriceService:
     """Service for fetching gas prices from Google Maps"""
     
     def __init__(self):
         self.api_key = Config.GOOGLE_MAPS_API_KEY
-        self.cache = {}  # Simple cache for API responses
-        self.cache_timeout = 3600  # 1 hour cache
+        self.cache_timeout = Config.PRICE_CACHE_TTL_SECONDS
+        # Prices keyed by (place_id, fuel_grade)
+        self.cache = TTLCache(
+            max_entries=Config.PRICE_CACHE_MAX_ENTRIES,
+            ttl=self.cache_timeout,
+            stale_ttl=Config.PRICE_CACHE_STALE_SECONDS
+        )
+        # place_id of the station at a location ('' when there is none)
+        self.place_ids = TTLCache(
+            max_entries=Config.PLACE_ID_CACHE_MAX_ENTRIES,
+            ttl=Config.PLACE_ID_CACHE_TTL_SECONDS
+        )
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=Config.PRICE_REFRESH_WORKERS, thread_name_prefix='price-refresh'
+        )
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
     
     def get_gas_prices(self, latitude: float, longitude: float, station_name: str = "") -> Dict[str, float]:
         """
@@ -36,13 +69,20 @@ class GasPriceService:
         # Return empty dict if no prices found
         return {}
     
-    def get_gas_prices_with_source(self, latitude: float, longitude: float, station_name: str = "") -> Dict[str, Any]:
+    def get_gas_prices_with_source(self, latitude: float, longitude: float, station_name: str = "",
+                                   place_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get gas prices with source information
         
+        When the place_id is known the prices are read straight from Place
+        Details; the latitude/longitude search is only used as a fallback.
+        
         Returns:
             Dict with 'prices' and 'source' keys
         """
+        if place_id:
+            return self.get_prices_for_place_id(place_id)
+        
         # Only try Google Maps
         prices = self._try_google_maps_prices(latitude, longitude, station_name)
         if prices:
@@ -51,13 +91,134 @@ class GasPriceService:
         # Return empty prices if none found
         return {'prices': {}, 'source': 'Not available'}
     
+    def get_prices_for_place_id(self, place_id: str) -> Dict[str, Any]:
+        """
+        Get gas prices for a single Google place_id
+        
+        Args:
+            place_id: Google Places place_id of the station
+            
+        Returns:
+            Dict with 'prices' and 'source' keys
+        """
+        prices = self._get_place_prices(place_id)
+        if prices:
+            return {'prices': prices, 'source': 'Google Maps'}
+        
+        return {'prices': {}, 'source': 'Not available'}
+    
+    def get_prices_for_place_ids(self, place_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get gas prices for many stations keyed by Google place_id
+        
+        Each place_id costs one Place Details request, and the requests run
+        concurrently (Config.PRICE_LOOKUP_WORKERS wide).
+        
+        Args:
+            place_ids: Google Places place_ids
+            
+        Returns:
+            Dict[str, Dict]: place_id -> dict with 'prices' and 'source' keys
+        """
+        unique_ids = list(dict.fromkeys(pid for pid in place_ids if pid))
+        results = bounded_map(
+            self.get_prices_for_place_id, unique_ids, Config.PRICE_LOOKUP_WORKERS,
+            default={'prices': {}, 'source': 'Not available'},
+            thread_name_prefix='place-details'
+        )
+        return dict(zip(unique_ids, results))
+    
+    def get_cached_prices(self, place_id: str) -> Tuple[Optional[Dict[str, float]], bool]:
+        """
+        Get a station's cached prices without calling Google
+        
+        Returns:
+            Tuple: (prices or None, True if any grade is stale)
+        """
+        return self._get_cached_prices(place_id)
+    
+    def get_cached_or_estimated_prices(self, place_id: Optional[str], price_level: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get prices without calling Google: cached prices if any, else an estimate
+        
+        Used by the lazy search mode, where fresh prices are only fetched for
+        stations the user opens (see record_place_details).
+        
+        Args:
+            place_id: Google Places place_id of the station (may be None)
+            price_level: Google price level (0-4) used for the estimate
+            
+        Returns:
+            Dict with 'prices' and 'source' keys
+        """
+        if place_id:
+            prices, _ = self.get_cached_prices(place_id)
+            if prices:
+                return {'prices': prices, 'source': 'Google Maps'}
+        
+        return {'prices': self.estimate_prices(price_level), 'source': 'Estimated'}
+    
+    def estimate_prices(self, price_level: Optional[int] = None) -> Dict[str, float]:
+        """
+        Estimate prices from Google's price level
+        
+        Unlike _generate_prices_from_level there is no random variation, so
+        estimated stations don't reorder between searches.
+        """
+        base_price = PRICE_LEVEL_BASE_PRICES.get(price_level, PRICE_LEVEL_BASE_PRICES[2])
+        return {
+            '87': round(base_price, 2),
+            '89': round(base_price + 0.25, 2),
+            '91': round(base_price + 0.50, 2)
+        }
+    
+    def record_place_details(self, place_id: str, result: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """
+        Extract prices from a Place Details result fetched elsewhere and cache them
+        
+        Args:
+            place_id: Google Places place_id of the station
+            result: The 'result' object of a Place Details response
+            
+        Returns:
+            Optional[Dict[str, float]]: Prices per fuel grade
+        """
+        prices = self._prices_from_place_details(result)
+        if prices:
+            for grade, price in prices.items():
+                self.cache.set((place_id, grade), price)
+        return prices
+    
     def _try_google_maps_prices(self, latitude: float, longitude: float, station_name: str) -> Optional[Dict[str, float]]:
         """
         Try to extract prices from Google Maps data
         """
+        place_id = self.find_place_id(latitude, longitude)
+        return self._get_place_prices(place_id) if place_id else None
+    
+    def find_place_id(self, latitude: float, longitude: float) -> Optional[str]:
+        """
+        Find the Google place_id of the gas station at a location
+        
+        Answers, including "no station here", are cached for
+        Config.PLACE_ID_CACHE_TTL_SECONDS, so each location costs at most
+        one nearbysearch. Failed requests are not cached.
+        
+        Args:
+            latitude: Station latitude
+            longitude: Station longitude
+            
+        Returns:
+            Optional[str]: place_id of a station within 100 meters, or None
+        """
         if not self.api_key:
             return None
         
+        key = (round(latitude, 5), round(longitude, 5))
+        cached = self.place_ids.get(key)
+        if cached is not None:
+            return cached or None
+        
         try:
             # Search for the specific station to get more details
             url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
@@ -68,25 +229,105 @@ class GasPriceService:
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 'OK' and data.get('results'):
-                    # Look for the station with matching name or closest location
-                    for place in data['results']:
-                        place_lat = place['geometry']['location']['lat']
-                        place_lng = place['geometry']['location']['lng']
-                        
-                        # Check if this is the same station (within 100 meters)
-                        if self._calculate_distance((latitude, longitude), (place_lat, place_lng)) < 0.1:
-                            # Try to get detailed place info which might have prices
-                            return self._extract_prices_from_place_details(place.get('place_id'))
-            
-            return None
-            
+            response = http_client.get(url, params=params, timeout=5)
+            if response.status_code != 200:
+                return None
+            data = response.json()
+            if data.get('status') not in ('OK', 'ZERO_RESULTS'):
+                return None
         except Exception as e:
             print(f"⚠️  Google Maps price extraction error: {e}")
             return None
+        
+        place_id = ''
+        # Look for the closest station (within 100 meters)
+        for place in data.get('results', []):
+            place_lat = place['geometry']['location']['lat']
+            place_lng = place['geometry']['location']['lng']
+            if self._calculate_distance((latitude, longitude), (place_lat, place_lng)) < 0.1:
+                place_id = place.get('place_id') or ''
+                break
+        
+        self.place_ids.set(key, place_id)
+        return place_id or None
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters for the price cache"""
+        return self.cache.stats()
+    
+    def _get_place_prices(self, place_id: Optional[str]) -> Optional[Dict[str, float]]:
+        """
+        Get prices for a place_id, serving from the cache when possible
+        
+        Fresh cached prices are returned directly. Stale prices are returned
+        immediately while a background refresh fetches new ones. Misses go
+        to Place Details and the result is cached per fuel grade.
+        """
+        if not place_id:
+            return None
+        
+        prices, is_stale = self._get_cached_prices(place_id)
+        if prices:
+            if is_stale:
+                self._schedule_refresh(place_id)
+            return prices
+        
+        return self._fetch_and_cache_prices(place_id)
+    
+    def _get_cached_prices(self, place_id: str) -> Tuple[Optional[Dict[str, float]], bool]:
+        """
+        Assemble cached per-grade prices for a station
+        
+        Returns:
+            Tuple: (prices or None, True if any grade is stale)
+        """
+        prices = {}
+        any_stale = False
+        for grade in FUEL_GRADES:
+            price, is_stale = self.cache.get_with_status((place_id, grade))
+            if price is not None:
+                prices[grade] = price
+                any_stale = any_stale or is_stale
+        
+        return (prices or None), any_stale
+    
+    def _fetch_and_cache_prices(self, place_id: str) -> Optional[Dict[str, float]]:
+        """
+        Fetch prices from Place Details and store each grade in the cache
+        
+        Concurrent fetches for the same place_id share one Place Details call.
+        """
+        prices = single_flight.do(('place_details', place_id), self._fetch_prices_uncoalesced, place_id)
+        return dict(prices) if prices else prices
+    
+    def _fetch_prices_uncoalesced(self, place_id: str) -> Optional[Dict[str, float]]:
+        """Call Place Details for a station and cache the prices it yields"""
+        prices = self._extract_prices_from_place_details(place_id)
+        if prices:
+            for grade, price in prices.items():
+                self.cache.set((place_id, grade), price)
+        return prices
+    
+    def _schedule_refresh(self, place_id: str) -> None:
+        """Refresh a station's prices in the background, once per place_id at a time"""
+        with self._refresh_lock:
+            if place_id in self._refreshing:
+                return
+            self._refreshing.add(place_id)
+        
+        def refresh():
+            try:
+                self._fetch_and_cache_prices(place_id)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(place_id)
+        
+        try:
+            self._refresh_executor.submit(refresh)
+        except RuntimeError:
+            # Executor is shut down (interpreter exiting)
+            with self._refresh_lock:
+                self._refreshing.discard(place_id)
     
     def _extract_prices_from_place_details(self, place_id: str) -> Optional[Dict[str, float]]:
         """
@@ -104,28 +345,11 @@ class GasPriceService:
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=5)
+            response = http_client.get(url, params=params, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('status') == 'OK' and data.get('result'):
-                    result = data['result']
-                    
-                    # Try to extract gas prices from editorial summary or reviews
-                    prices = self._extract_prices_from_text(result.get('editorial_summary', {}).get('overview', ''))
-                    if not prices:
-                        # Try to extract from reviews
-                        reviews = result.get('reviews', [])
-                        for review in reviews[:3]:  # Check first 3 reviews
-                            prices = self._extract_prices_from_text(review.get('text', ''))
-                            if prices:
-                                break
-                    
-                    if prices:
-                        return prices
-                    
-                    # Fallback to price level if no specific prices found
-                    price_level = result.get('price_level', 2)  # 0-4 scale
-                    return self._generate_prices_from_level(price_level)
+                    return self._prices_from_place_details(data['result'])
             
             return None
             
@@ -133,6 +357,25 @@ class GasPriceService:
             print(f"⚠️  Place details extraction error: {e}")
             return None
     
+    def _prices_from_place_details(self, result: Dict[str, Any]) -> Dict[str, float]:
+        """Read prices from a Place Details result, falling back to its price level"""
+        # Try to extract gas prices from editorial summary or reviews
+        prices = self._extract_prices_from_text(result.get('editorial_summary', {}).get('overview', ''))
+        if not prices:
+            # Try to extract from reviews
+            reviews = result.get('reviews', [])
+            for review in reviews[:3]:  # Check first 3 reviews
+                prices = self._extract_prices_from_text(review.get('text', ''))
+                if prices:
+                    break
+        
+        if prices:
+            return prices
+        
+        # Fallback to price level if no specific prices found
+        price_level = result.get('price_level', 2)  # 0-4 scale
+        return self._generate_prices_from_level(price_level)
+    
     def _extract_prices_from_text(self, text: str) -> Optional[Dict[str, float]]:
         """
         Extract gas prices from text (like Google Maps descriptions or reviews)
@@ -197,16 +440,7 @@ class GasPriceService:
         """
         Generate realistic prices based on Google's price level (Updated for 2024)
         """
-        # Base prices for different price levels (0-4 scale) - Updated for 2024
-        base_prices = {
-            0: 3.80,  # Very cheap
-            1: 4.10,  # Cheap
-            2: 4.40,  # Moderate
-            3: 4.80,  # Expensive
-            4: 5.20   # Very expensive
-        }
-        
-        base_price = base_prices.get(price_level, 4.40)
+        base_price = PRICE_LEVEL_BASE_PRICES.get(price_level, PRICE_LEVEL_BASE_PRICES[2])
         
         # Add some realistic variation
         variation = random.uniform(-0.20, 0.20)
@@ -221,24 +455,7 @@ class GasPriceService:
         """
         Calculate distance between two points in miles
         """
-        import math
-        
-        lat1, lon1 = point1
-        lat2, lon2 = point2
-        
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth's radius in miles
-        r = 3956
-        
-        return c * r
+        return haversine_miles(point1[0], point1[1], point2[0], point2[1])
 
 # Global instance
 gas_price_service = GasPriceService()
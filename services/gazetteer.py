@@ -0,0 +1,131 @@
+"""
+Offline gazetteer for Gas Station Recommendation App
+"""
+
+import csv
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import List, Optional, Tuple
+from config import Config
+
+# City and ZIP centroids shipped with the app (kind,name,state,latitude,longitude)
+BUNDLED_GAZETTEER_PATH = Path(__file__).resolve().parent.parent / 'data' / 'gazetteer' / 'us_places.csv'
+
+_CITY_STATE = re.compile(r"^([a-z][a-z .'-]*?)\s*,\s*([a-z]{2})(?:\s+(\d{5})(?:-\d{4})?)?$")
+_ZIP = re.compile(r'^(\d{5})(?:-\d{4})?$')
+_COUNTRY_SUFFIX = re.compile(r'\s*,\s*(?:usa|us|united states)$')
+_CITY_PREFIXES = (('st ', 'saint '), ('ft ', 'fort '), ('mt ', 'mount '))
+
+def _city_key(city: str, state: str) -> str:
+    city = ' '.join(city.lower().replace('.', ' ').split())
+    for short, full in _CITY_PREFIXES:
+        if city.startswith(short):
+            city = full + city[len(short):]
+            break
+    return f"city:{city}|{state.lower()}"
+
+def _zip_key(zip_code: str) -> str:
+    return f"zip:{zip_code}"
+
+class Gazetteer:
+    """
+    In-memory city/state and ZIP centroid table for geocoding without a network call
+
+    Only queries that are nothing but "City, ST" (optionally followed by a
+    ZIP) or a bare ZIP code are answered; anything with a street is left to
+    the geocoding providers. The table is read on first use into a sorted
+    key tuple with parallel coordinate arrays and searched by bisection.
+    """
+
+    def __init__(self, paths: Optional[List[str]] = None):
+        """
+        Args:
+            paths: CSV files to load, later files overriding earlier ones
+                (default: the bundled table plus Config.GAZETTEER_EXTRA_PATH)
+        """
+        if paths is None:
+            paths = [str(BUNDLED_GAZETTEER_PATH)]
+            if Config.GAZETTEER_EXTRA_PATH:
+                paths += Config.GAZETTEER_EXTRA_PATH.split(os.pathsep)
+        self.paths = paths
+        self._keys: Optional[Tuple[str, ...]] = None
+        self._latitudes = array('d')
+        self._longitudes = array('d')
+        self._lock = threading.Lock()
+
+    def lookup(self, query: str) -> Optional[Tuple[float, float]]:
+        """
+        Resolve a "City, ST" or ZIP code query
+
+        Args:
+            query: Address string as typed by the user
+
+        Returns:
+            Optional[Tuple[float, float]]: (latitude, longitude) centroid, or None
+            if the query isn't a bare city/ZIP or the place is unknown
+        """
+        keys = self._query_keys(query)
+        if not keys:
+            return None
+
+        index = self._keys if self._keys is not None else self._load()
+        for key in keys:
+            position = bisect_left(index, key)
+            if position < len(index) and index[position] == key:
+                return (self._latitudes[position], self._longitudes[position])
+        return None
+
+    def __len__(self) -> int:
+        return len(self._keys if self._keys is not None else self._load())
+
+    def _query_keys(self, query: str) -> List[str]:
+        """Index keys to try for a query, most precise first"""
+        text = _COUNTRY_SUFFIX.sub('', ' '.join(query.lower().split()))
+        match = _ZIP.match(text)
+        if match:
+            return [_zip_key(match.group(1))]
+
+        match = _CITY_STATE.match(text)
+        if not match:
+            return []
+        city, state, zip_code = match.groups()
+        keys = [_zip_key(zip_code)] if zip_code else []
+        keys.append(_city_key(city, state))
+        return keys
+
+    def _load(self) -> Tuple[str, ...]:
+        """Read the CSV files and build the sorted index"""
+        with self._lock:
+            if self._keys is not None:
+                return self._keys
+
+            places = {}
+            for path in self.paths:
+                try:
+                    with open(path, 'r', encoding='utf-8', newline='') as f:
+                        for row in csv.DictReader(f):
+                            if row['kind'] == 'zip':
+                                key = _zip_key(row['name'].strip().zfill(5))
+                            else:
+                                key = _city_key(row['name'], row['state'].strip())
+                            places[key] = (float(row['latitude']), float(row['longitude']))
+                except (OSError, KeyError, ValueError) as e:
+                    print(f"⚠️  Could not load gazetteer {path}: {e}")
+
+            keys = sorted(places)
+            self._latitudes = array('d', (places[key][0] for key in keys))
+            self._longitudes = array('d', (places[key][1] for key in keys))
+            self._keys = tuple(keys)
+            return self._keys
+
+# Global instance
+gazetteer = Gazetteer()
+
+# Convenience functions
+def lookup_place(query: str) -> Optional[Tuple[float, float]]:
+    """Convenience function for offline city/ZIP lookups"""
+    return gazetteer.lookup(query)
@@ -4,9 +4,10 @@ LLM service for Gas Station Recommendation App
 
 import json
 import time
-from typing import List, Dict, Any, Optional
-import requests
+from typing import List, Dict, Any, Iterator, Optional
 from config import Config
+from utils.http_client import http_client
+from .analysis_cache import AnalysisCache, analysis_cache_key
 
 class LLMService:
     """Service for handling LLM interactions and analysis"""
@@ -17,14 +18,18 @@ class LLMService:
         self.model = Config.LLM_MODEL
         self.max_tokens = Config.MAX_TOKENS
         self.temperature = Config.TEMPERATURE
+        self.cache = AnalysisCache()  # Analyses keyed by content hash
     
-    def analyze_with_llm(self, station_data: List[Dict[str, Any]], fuel_grade: str = "87") -> str:
+    def analyze_with_llm(self, station_data: List[Dict[str, Any]], fuel_grade: str = "87",
+                         fuel_needed: Optional[float] = None, mpg: Optional[float] = None) -> str:
         """
         Analyze gas station data with LLM and provide recommendations
         
         Args:
             station_data: List of gas station data
             fuel_grade: Fuel grade to consider (87, 89, 91)
+            fuel_needed: Gallons the user needs (part of the cache key)
+            mpg: Miles per gallon of the user's car (part of the cache key)
             
         Returns:
             str: LLM analysis and recommendations
@@ -32,20 +37,98 @@ class LLMService:
         if not station_data:
             return "No gas stations found to analyze."
         
+        provider = self._provider_name()
+        if provider is None:
+            return self._generate_mock_analysis(station_data, fuel_grade)
+        
+        # Reuse an identical recent analysis
+        cache_key = analysis_cache_key(station_data, fuel_grade, provider, fuel_needed, mpg)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Format input for LLM
         input_prompt = self._format_station_data(station_data, fuel_grade)
         
         # Try Claude first, then OpenAI, then fallback
         try:
             if self.claude_api_key:
-                return self._call_claude_api(input_prompt)
-            elif self.openai_api_key:
-                return self._call_openai_api(input_prompt)
+                analysis = self._call_claude_api(input_prompt)
             else:
-                return self._generate_mock_analysis(station_data, fuel_grade)
+                analysis = self._call_openai_api(input_prompt)
         except Exception as e:
             print(f"⚠️  LLM API error: {e}")
             return self._generate_mock_analysis(station_data, fuel_grade)
+        
+        self.cache.set(cache_key, analysis)
+        return analysis
+    
+    def _provider_name(self) -> Optional[str]:
+        """Identify the configured LLM provider and model, or None for mock mode"""
+        if self.claude_api_key:
+            return f"claude:{self.model}"
+        elif self.openai_api_key:
+            return "openai:gpt-4"
+        return None
+    
+    def stream_analysis(self, station_data: List[Dict[str, Any]], fuel_grade: str = "87",
+                        fuel_needed: Optional[float] = None, mpg: Optional[float] = None) -> Iterator[str]:
+        """
+        Analyze gas station data with LLM, yielding text as it is generated
+        
+        Uses the provider's streaming API so the first tokens arrive long before
+        the full completion. Falls back to the mock analysis (also streamed) if
+        no provider is configured or the provider fails before sending anything;
+        a failure after some text was sent is re-raised.
+        
+        Args:
+            station_data: List of gas station data
+            fuel_grade: Fuel grade to consider (87, 89, 91)
+            fuel_needed: Gallons the user needs (part of the cache key)
+            mpg: Miles per gallon of the user's car (part of the cache key)
+            
+        Yields:
+            str: Successive chunks of the analysis text
+        """
+        if not station_data:
+            yield "No gas stations found to analyze."
+            return
+        
+        provider = self._provider_name()
+        if provider is None:
+            yield from self._stream_mock_analysis(station_data, fuel_grade)
+            return
+        
+        # A cached analysis is sent whole
+        cache_key = analysis_cache_key(station_data, fuel_grade, provider, fuel_needed, mpg)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        input_prompt = self._format_station_data(station_data, fuel_grade)
+        
+        if self.claude_api_key:
+            chunks = self._stream_claude_api(input_prompt)
+        else:
+            chunks = self._stream_openai_api(input_prompt)
+        
+        received = []
+        try:
+            for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+        except Exception as e:
+            print(f"⚠️  LLM streaming error: {e}")
+            if received:
+                # The text sent so far is incomplete; let the caller report it
+                raise
+            yield from self._stream_mock_analysis(station_data, fuel_grade)
+            return
+        
+        # The provider streams raise unless they saw their terminal event, so this is complete
+        if received:
+            self.cache.set(cache_key, ''.join(received))
     
     def _format_station_data(self, stations: List[Dict[str, Any]], fuel_grade: str = "87") -> str:
         """
@@ -143,7 +226,7 @@ Here are the gas station options:
             ]
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = http_client.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -181,12 +264,141 @@ Here are the gas station options:
             "temperature": self.temperature
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = http_client.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
         return result['choices'][0]['message']['content']
     
+    def _stream_claude_api(self, prompt: str) -> Iterator[str]:
+        """
+        Call Claude API with streaming enabled
+        
+        Args:
+            prompt: Formatted prompt for Claude
+            
+        Yields:
+            str: Text deltas as Claude generates them
+            
+        Raises:
+            RuntimeError: If the stream reports an error or ends before message_stop
+        """
+        url = "https://api.anthropic.com/v1/messages"
+        headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.claude_api_key,
+            "anthropic-version": "2023-06-01"
+        }
+        
+        data = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stream": True,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        
+        with http_client.post(url, headers=headers, json=data, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            for event in self._iter_sse_data(response):
+                if event.get('type') == 'content_block_delta':
+                    text = event.get('delta', {}).get('text')
+                    if text:
+                        yield text
+                elif event.get('type') == 'message_stop':
+                    return
+                elif event.get('type') == 'error':
+                    raise RuntimeError(event.get('error', {}).get('message', 'Claude streaming error'))
+        # The connection closed mid-message; what was sent is incomplete
+        raise RuntimeError("Claude stream ended before message_stop")
+    
+    def _stream_openai_api(self, prompt: str) -> Iterator[str]:
+        """
+        Call OpenAI API with streaming enabled
+        
+        Args:
+            prompt: Formatted prompt for OpenAI
+            
+        Yields:
+            str: Content deltas as OpenAI generates them
+            
+        Raises:
+            RuntimeError: If the stream ends before a choice reports its finish_reason
+        """
+        url = "https://api.openai.com/v1/chat/completions"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.openai_api_key}"
+        }
+        
+        data = {
+            "model": "gpt-4",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert gas station recommendation assistant."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stream": True
+        }
+        
+        with http_client.post(url, headers=headers, json=data, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            finished = False
+            for event in self._iter_sse_data(response):
+                choices = event.get('choices') or [{}]
+                text = choices[0].get('delta', {}).get('content')
+                if text:
+                    yield text
+                if choices[0].get('finish_reason'):
+                    finished = True
+        if not finished:
+            # The connection closed mid-completion; what was sent is incomplete
+            raise RuntimeError("OpenAI stream ended before finish_reason")
+    
+    def _iter_sse_data(self, response) -> Iterator[Dict[str, Any]]:
+        """
+        Parse the JSON payloads of a server-sent events response
+        
+        Args:
+            response: Streaming HTTP response
+            
+        Yields:
+            Dict: Decoded 'data:' payload of each event
+        """
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data:'):
+                continue
+            payload = line[len('data:'):].strip()
+            if payload == '[DONE]':
+                break
+            yield json.loads(payload)
+    
+    def _stream_mock_analysis(self, stations: List[Dict[str, Any]], fuel_grade: str = "87") -> Iterator[str]:
+        """
+        Stream the mock analysis line by line
+        
+        Args:
+            stations: List of gas station data
+            fuel_grade: Fuel grade to consider (87, 89, 91)
+            
+        Yields:
+            str: Lines of the mock analysis
+        """
+        for line in self._generate_mock_analysis(stations, fuel_grade).splitlines(keepends=True):
+            yield line
+    
     def _generate_mock_analysis(self, stations: List[Dict[str, Any]], fuel_grade: str = "87") -> str:
         """
         Generate mock analysis when LLM APIs are unavailable
@@ -288,9 +500,10 @@ Here are the gas station options:
 llm_service = LLMService()
 
 # Convenience functions
-def analyze_with_llm(station_data: List[Dict[str, Any]], fuel_grade: str = "87") -> str:
+def analyze_with_llm(station_data: List[Dict[str, Any]], fuel_grade: str = "87",
+                     fuel_needed: Optional[float] = None, mpg: Optional[float] = None) -> str:
     """Convenience function for LLM analysis"""
-    return llm_service.analyze_with_llm(station_data, fuel_grade)
+    return llm_service.analyze_with_llm(station_data, fuel_grade, fuel_needed, mpg)
 
 def summarize_stations(stations: List[Dict[str, Any]]) -> str:
     """Convenience function for station summary"""
@@ -2,20 +2,60 @@
 Location service for Gas Station Recommendation App
 """
 
+import threading
 import time
-import requests
-from typing import Tuple, Optional, Dict, Any
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, Tuple, Optional, Dict, Any
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
 from models.schema import Location
 from config import Config
+from utils.geo import MILES_PER_DEGREE_LAT, haversine_miles
+from utils.http_client import http_client
+from utils.persistent_cache import SQLiteCache
+from utils.rate_limit import RateLimiter
+from utils.singleflight import single_flight
+from .gazetteer import gazetteer
+
+METERS_PER_DEGREE_LAT = MILES_PER_DEGREE_LAT * 1609.34
+
+# Outcomes of a single provider lookup
+GEOCODE_FOUND = 'found'
+GEOCODE_EMPTY = 'empty'  # The provider answered and has no result
+GEOCODE_FAILED = 'failed'  # The request errored or timed out
+GEOCODE_SKIPPED = 'skipped'  # Not sent: rate limit, deadline, or an answer was already chosen
 
 class LocationService:
     """Service for handling location-related operations"""
     
     def __init__(self):
         self.geolocator = Nominatim(user_agent="gas-station-recommendation-app")
-        self.cache = {}  # Simple cache for geocoding results
+        self.cache = self._open_cache('geocode', Config.GEOCODE_CACHE_MAX_ENTRIES)
+        self.reverse_cache = self._open_cache('reverse_geocode', Config.REVERSE_GEOCODE_CACHE_MAX_ENTRIES)
+        self.nominatim_limiter = RateLimiter(Config.NOMINATIM_MAX_REQUESTS_PER_SECOND)
+    
+    def _open_cache(self, table: str, max_entries: int) -> SQLiteCache:
+        """Open a table of the shared geocode cache, falling back to a private in-memory one"""
+        path = Config.GEOCODE_CACHE_PATH or ':memory:'
+        try:
+            return SQLiteCache(path, table, max_entries, Config.GEOCODE_CACHE_TTL_SECONDS,
+                               Config.GEOCODE_NEGATIVE_TTL_SECONDS)
+        except Exception as e:
+            print(f"⚠️  Could not open geocode cache at {path}: {e}. Using memory only.")
+            return SQLiteCache(':memory:', table, max_entries, Config.GEOCODE_CACHE_TTL_SECONDS,
+                               Config.GEOCODE_NEGATIVE_TTL_SECONDS)
+    
+    def _normalize_address(self, address: str) -> str:
+        """
+        Normalize an address for cache lookups
+        
+        Case, Unicode forms, periods, whitespace and spacing around commas
+        are ignored, so "123 Main St." and " 123 main st" share an entry.
+        """
+        address = unicodedata.normalize('NFKC', address).lower().replace('.', ' ')
+        parts = [' '.join(part.split()) for part in address.split(',')]
+        return ', '.join(part for part in parts if part)
     
     def geocode_address(self, address: str) -> Tuple[float, float]:
         """
@@ -30,40 +70,179 @@ class LocationService:
         Raises:
             Exception: If geocoding fails
         """
-        # Check cache first
-        if address in self.cache:
-            return self.cache[address]
-        
-        # Try multiple address variations
-        address_variations = self._generate_address_variations(address)
-        
-        # Try Google Maps API first if available
-        if Config.GOOGLE_MAPS_API_KEY:
-            for variation in address_variations:
-                try:
-                    coords = self._geocode_with_google(variation)
-                    if coords:
-                        self.cache[address] = coords
-                        print(f"✅ Successfully geocoded: {variation}")
-                        return coords
-                except Exception as e:
-                    print(f"⚠️  Google geocoding failed for '{variation}': {e}")
-        
-        # Fallback to Nominatim with better error handling
-        for variation in address_variations:
-            try:
-                coords = self._geocode_with_nominatim(variation)
-                if coords:
-                    self.cache[address] = coords
+        # Bare "City, ST" and ZIP queries resolve offline
+        if Config.OFFLINE_GAZETTEER:
+            coords = gazetteer.lookup(address)
+            if coords is not None:
+                return coords
+        
+        # Check cache first (shared with the other workers)
+        key = self._normalize_address(address)
+        found, coords = self.cache.lookup(key)
+        if found:
+            if coords is None:
+                # Recently failed; don't query the providers again yet
+                return (Config.DEFAULT_LATITUDE, Config.DEFAULT_LONGITUDE)
+            return tuple(coords)
+        
+        # Concurrent lookups of the same address share one geocoding run
+        return single_flight.do(('geocode', key), self._geocode_uncached, address, key)
+    
+    def _geocode_uncached(self, address: str, key: str) -> Tuple[float, float]:
+        """
+        Geocode an address by racing its variations across providers, caching the result
+        
+        Google lookups for every variation start at once. Nominatim tries the
+        variations one after another in priority order, through the rate
+        limiter, and stops at its first hit; it starts after
+        Config.GEOCODE_HEDGE_DELAY_SECONDS (at once without a Google key, or
+        as soon as every Google lookup has finished). Answers rank by
+        variation priority, then provider. The best answer is taken as soon
+        as nothing better can still arrive, a high-confidence answer is taken
+        as soon as it arrives, and whatever is best at the deadline is used.
+        The deadline is Config.GEOCODE_DEADLINE_SECONDS, stretched if needed
+        so the Nominatim chain can reach every variation. Outstanding lookups
+        are abandoned.
+        """
+        variations = list(dict.fromkeys(self._generate_address_variations(address)))
+        use_google = bool(Config.GOOGLE_MAPS_API_KEY)
+        
+        start = time.monotonic()
+        hedge_delay = Config.GEOCODE_HEDGE_DELAY_SECONDS if use_google else 0.0
+        chain_time = (len(variations) - 1) / Config.NOMINATIM_MAX_REQUESTS_PER_SECOND + Config.GEOCODE_REQUEST_TIMEOUT_SECONDS
+        deadline = start + max(Config.GEOCODE_DEADLINE_SECONDS, hedge_delay + chain_time)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(variations) + 1, thread_name_prefix='geocode')
+        
+        pending = {}
+        if use_google:
+            for index, variation in enumerate(variations):
+                future = executor.submit(self._geocode_attempt, 'google', variation, deadline, stop)
+                pending[future] = (index, 0)
+        chain = [Future() for _ in variations]
+        chain_started = False
+        
+        outcomes = {}
+        answers = {}
+        try:
+            while True:
+                now = time.monotonic()
+                if not chain_started and (now >= start + hedge_delay or not pending):
+                    executor.submit(self._nominatim_chain, variations, chain, deadline, stop)
+                    pending.update({future: (index, 1) for index, future in enumerate(chain)})
+                    chain_started = True
+                
+                outstanding = set(pending.values())
+                if not chain_started:
+                    outstanding |= {(index, 1) for index in range(len(variations))}
+                accepted = self._pick_geocode_answer(answers, outstanding)
+                if accepted is not None:
+                    coords, _, variation = answers[accepted]
+                    self.cache.set(key, coords)
                     print(f"✅ Successfully geocoded: {variation}")
                     return coords
-            except Exception as e:
-                print(f"⚠️  Nominatim geocoding failed for '{variation}': {e}")
+                
+                if not pending or now >= deadline:
+                    break
+                
+                wake_at = deadline if chain_started else min(deadline, start + hedge_delay)
+                done, _ = wait(list(pending), timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    priority = pending.pop(future)
+                    outcome, answer = future.result()
+                    outcomes[priority] = outcome
+                    if answer is not None:
+                        answers[priority] = answer
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if answers:
+            # Deadline hit: settle for the best answer so far
+            coords, _, variation = answers[min(answers)]
+            self.cache.set(key, coords)
+            print(f"✅ Successfully geocoded: {variation}")
+            return coords
+        
+        if not pending and GEOCODE_FAILED not in outcomes.values() and all(
+                GEOCODE_EMPTY in (outcomes.get((index, 0)), outcomes.get((index, 1)))
+                for index in range(len(variations))):
+            # A provider definitely had no result for every variation and none
+            # errored; failed or skipped lookups may succeed next time
+            self.cache.set_missing(key)
         
         # Final fallback to default location
-        print(f"⚠️  Could not geocode address: {address}. Using default location.")
+        skipped = sum(1 for outcome in outcomes.values() if outcome == GEOCODE_SKIPPED) + len(pending)
+        failed = sum(1 for outcome in outcomes.values() if outcome == GEOCODE_FAILED)
+        print(f"⚠️  Could not geocode address: {address} ({failed} lookups failed, "
+              f"{skipped} skipped by the rate limit or deadline). Using default location.")
         return (Config.DEFAULT_LATITUDE, Config.DEFAULT_LONGITUDE)
     
+    def _pick_geocode_answer(self, answers: Dict[Tuple[int, int], Tuple[Tuple[float, float], bool, str]],
+                             outstanding: set) -> Optional[Tuple[int, int]]:
+        """
+        Choose an answer that can be returned without waiting any longer
+        
+        Args:
+            answers: (variation index, provider rank) -> (coords, confident, variation)
+            outstanding: Priorities still running or not yet started
+            
+        Returns:
+            Optional[Tuple]: Priority of the answer to use, or None to keep waiting
+        """
+        if not answers:
+            return None
+        best = min(answers)
+        if all(priority > best for priority in outstanding):
+            return best
+        confident = [priority for priority, answer in answers.items() if answer[1]]
+        return min(confident) if confident else None
+    
+    def _nominatim_chain(self, variations: List[str], futures: List[Future], deadline: float,
+                         stop: threading.Event) -> None:
+        """Try variations on Nominatim in priority order, stopping at the first hit"""
+        found = False
+        try:
+            for variation, future in zip(variations, futures):
+                if found:
+                    future.set_result((GEOCODE_SKIPPED, None))
+                    continue
+                outcome = self._geocode_attempt('nominatim', variation, deadline, stop)
+                future.set_result(outcome)
+                found = outcome[0] == GEOCODE_FOUND
+        finally:
+            for future in futures:
+                if not future.done():
+                    future.set_result((GEOCODE_FAILED, None))
+    
+    def _geocode_attempt(self, provider: str, variation: str, deadline: float,
+                         stop: threading.Event) -> Tuple[str, Optional[Tuple[Tuple[float, float], bool, str]]]:
+        """
+        Run one provider lookup within the deadline
+        
+        Returns:
+            Tuple: (outcome, (coords, confident, variation) or None). The outcome
+            tells a definite "no result" (GEOCODE_EMPTY) apart from a lookup that
+            errored (GEOCODE_FAILED) or never ran (GEOCODE_SKIPPED).
+        """
+        remaining = deadline - time.monotonic()
+        if stop.is_set() or remaining <= 0:
+            return GEOCODE_SKIPPED, None
+        try:
+            if provider == 'google':
+                result = self._geocode_with_google(variation, timeout=min(Config.GEOCODE_REQUEST_TIMEOUT_SECONDS, remaining))
+            else:
+                if not self.nominatim_limiter.acquire(timeout=remaining) or stop.is_set():
+                    return GEOCODE_SKIPPED, None
+                remaining = max(deadline - time.monotonic(), 0.1)
+                result = self._geocode_with_nominatim(variation, timeout=min(Config.GEOCODE_REQUEST_TIMEOUT_SECONDS, remaining))
+        except Exception as e:
+            print(f"⚠️  {provider.title()} geocoding failed for '{variation}': {e}")
+            return GEOCODE_FAILED, None
+        if result is None:
+            return GEOCODE_EMPTY, None
+        return GEOCODE_FOUND, (result[0], result[1], variation)
+    
     def _generate_address_variations(self, address: str) -> list:
         """Generate multiple variations of an address to try"""
         variations = []
@@ -147,45 +326,71 @@ class LocationService:
         
         return None
     
-    def _geocode_with_google(self, address: str) -> Optional[Tuple[float, float]]:
-        """Geocode using Google Maps API"""
-        try:
-            url = "https://maps.googleapis.com/maps/api/geocode/json"
-            params = {
-                'address': address,
-                'key': Config.GOOGLE_MAPS_API_KEY
-            }
-            
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') == 'OK' and data.get('results'):
-                location = data['results'][0]['geometry']['location']
-                return (location['lat'], location['lng'])
-            
-            return None
+    def _geocode_with_google(self, address: str,
+                             timeout: float = 5) -> Optional[Tuple[Tuple[float, float], bool]]:
+        """
+        Geocode using Google Maps API
+        
+        Returns:
+            Optional[Tuple]: ((latitude, longitude), confident), where confident
+            means a full match at street-address precision, or None if Google
+            has no result for the address
             
-        except Exception as e:
-            print(f"⚠️  Google geocoding error: {e}")
+        Raises:
+            Exception: If the request fails or Google reports an error status
+        """
+        url = "https://maps.googleapis.com/maps/api/geocode/json"
+        params = {
+            'address': address,
+            'key': Config.GOOGLE_MAPS_API_KEY
+        }
+        
+        response = http_client.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        
+        data = response.json()
+        status = data.get('status')
+        if status == 'ZERO_RESULTS':
             return None
+        if status != 'OK' or not data.get('results'):
+            raise RuntimeError(f"Google geocoding status {status}")
+        
+        result = data['results'][0]
+        location = result['geometry']['location']
+        confident = (
+            not result.get('partial_match')
+            and result['geometry'].get('location_type') in ('ROOFTOP', 'RANGE_INTERPOLATED')
+        )
+        return (location['lat'], location['lng']), confident
     
-    def _geocode_with_nominatim(self, address: str) -> Optional[Tuple[float, float]]:
-        """Geocode using Nominatim with timeout"""
-        try:
-            location = self.geolocator.geocode(address, timeout=5)
-            if location:
-                return (location.latitude, location.longitude)
-            return None
-        except Exception as e:
-            print(f"⚠️  Nominatim geocoding error: {e}")
-            return None
+    def _geocode_with_nominatim(self, address: str,
+                                timeout: float = 5) -> Optional[Tuple[Tuple[float, float], bool]]:
+        """
+        Geocode using Nominatim with timeout
+        
+        Callers are responsible for the Nominatim rate limit.
+        
+        Returns:
+            Optional[Tuple]: ((latitude, longitude), confident), where confident
+            means the match is a house or building, or None if Nominatim has
+            no result for the address
+            
+        Raises:
+            Exception: If the request fails or times out
+        """
+        location = self.geolocator.geocode(address, timeout=timeout)
+        if location:
+            confident = location.raw.get('type') in ('house', 'building')
+            return (location.latitude, location.longitude), confident
+        return None
     
     def reverse_geocode(self, latitude: float, longitude: float) -> Optional[str]:
         """
         Convert coordinates to address
         
+        Results are cached per grid cell of Config.REVERSE_GEOCODE_GRID_METERS,
+        so nearby coordinates share one lookup.
+        
         Args:
             latitude: Latitude coordinate
             longitude: Longitude coordinate
@@ -193,12 +398,81 @@ class LocationService:
         Returns:
             Optional[str]: Address string or None if reverse geocoding fails
         """
+        key = self._reverse_cache_key(latitude, longitude)
+        found, address = self.reverse_cache.lookup(key)
+        if found:
+            return address
+        return single_flight.do(('reverse_geocode', key), self._reverse_geocode_uncached, latitude, longitude, key)
+    
+    def reverse_geocode_batch(self, coordinates: List[Tuple[float, float]],
+                              timeout: Optional[float] = None) -> List[Optional[str]]:
+        """
+        Convert many coordinates to addresses
+        
+        Coordinates are grouped by cache cell, cached cells are answered
+        locally, and the remaining cells are looked up one at a time through
+        the Nominatim rate limiter.
+        
+        Args:
+            coordinates: (latitude, longitude) pairs
+            timeout: Seconds to spend on network lookups; cells not reached
+                in time come back as None (None waits for all of them)
+            
+        Returns:
+            List[Optional[str]]: One address (or None) per coordinate pair, in order
+        """
+        keys = [self._reverse_cache_key(latitude, longitude) for latitude, longitude in coordinates]
+        
+        resolved = {}
+        misses = {}
+        for key, point in zip(keys, coordinates):
+            if key in resolved or key in misses:
+                continue
+            found, address = self.reverse_cache.lookup(key)
+            if found:
+                resolved[key] = address
+            else:
+                misses[key] = point
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for key, (latitude, longitude) in misses.items():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            resolved[key] = single_flight.do(
+                ('reverse_geocode', key), self._reverse_geocode_uncached, latitude, longitude, key, remaining
+            )
+        
+        return [resolved.get(key) for key in keys]
+    
+    def _reverse_cache_key(self, latitude: float, longitude: float) -> str:
+        """
+        Quantize coordinates to their reverse geocode cache cell
+        
+        Cells are Config.REVERSE_GEOCODE_GRID_METERS of latitude on each side
+        (narrower east-west away from the equator). The grid size is part of
+        the key, so changing it never serves answers from the old grid.
+        """
+        grid_meters = Config.REVERSE_GEOCODE_GRID_METERS
+        step = grid_meters / METERS_PER_DEGREE_LAT
+        return f"{grid_meters:g}:{round(latitude / step)}:{round(longitude / step)}"
+    
+    def _reverse_geocode_uncached(self, latitude: float, longitude: float, key: str,
+                                  wait: Optional[float] = None) -> Optional[str]:
+        """Reverse geocode through Nominatim and cache the answer for the cell"""
         try:
+            if not self.nominatim_limiter.acquire(timeout=wait):
+                return None
             location = self.geolocator.reverse((latitude, longitude), timeout=10)
-            return location.address if location else None
         except Exception as e:
             print(f"⚠️  Reverse geocoding error: {e}")
             return None
+        
+        if location is None:
+            self.reverse_cache.set_missing(key)
+            return None
+        self.reverse_cache.set(key, location.address)
+        return location.address
     
     def use_current_location(self) -> Tuple[float, float]:
         """
@@ -228,7 +502,7 @@ class LocationService:
             Tuple[float, float]: (latitude, longitude)
         """
         try:
-            response = requests.get('http://ip-api.com/json/', timeout=5)
+            response = http_client.get('http://ip-api.com/json/', timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('status') == 'success':
@@ -253,21 +527,7 @@ class LocationService:
         Returns:
             float: Distance in miles
         """
-        import math
-        
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth's radius in miles
-        r = 3956
-        
-        return c * r
+        return haversine_miles(lat1, lon1, lat2, lon2)
     
     def validate_coordinates(self, latitude: float, longitude: float) -> bool:
         """
@@ -320,6 +580,11 @@ def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
     """Convenience function for reverse geocoding"""
     return location_service.reverse_geocode(latitude, longitude)
 
+def reverse_geocode_batch(coordinates: List[Tuple[float, float]],
+                          timeout: Optional[float] = None) -> List[Optional[str]]:
+    """Convenience function for reverse geocoding many coordinates"""
+    return location_service.reverse_geocode_batch(coordinates, timeout)
+
 def get_location_from_ip() -> Tuple[float, float]:
     """Convenience function for IP-based geolocation"""
     return location_service.get_location_from_ip() 
\ No newline at end of file
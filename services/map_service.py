@@ -3,13 +3,22 @@ Map service for Gas Station Recommendation App
 """
 
 import json
+import math
 import random
 import time
-from typing import List, Dict, Any, Tuple, Optional
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Tuple, Optional
 from models.schema import GasStation, Location
 from config import Config
+from utils.http_client import http_client
+from utils.cache import TTLCache
+from utils.concurrency import bounded_map
+from utils.geo import haversine_miles, haversine_one_to_many, hex_cover, tiles_intersecting_circle
+from utils.singleflight import single_flight
 from .gas_price_service import gas_price_service
+from .places_search import PLACES_PAGE_SIZE, PlacesCoverage
+from .station_catalog import station_catalog
+from .station_tile_cache import StationTileCache
 
 class MapService:
     """Service for handling map-related operations and gas station searches"""
@@ -17,7 +26,21 @@ class MapService:
     def __init__(self):
         self.api_key = Config.GOOGLE_MAPS_API_KEY
         self.base_url = "https://maps.googleapis.com/maps/api"
-        self.cache = {}  # Simple cache for API responses
+        self.cache = StationTileCache()  # Station results by geo tile
+        self.places_executor = ThreadPoolExecutor(  # Shared by every search's nearbysearch queries
+            max_workers=Config.PLACES_SUBQUERY_WORKERS, thread_name_prefix='places-query'
+        )
+        self.catalog = station_catalog  # Known stations, filled from bulk files and every search
+        self.lazy_details = Config.LAZY_STATION_DETAILS  # Search with cached/estimated prices only
+        self.details_cache = TTLCache(
+            max_entries=Config.STATION_DETAILS_MAX_ENTRIES,
+            ttl=Config.STATION_DETAILS_TTL_SECONDS
+        )
+        if Config.STATION_CATALOG_PATH:
+            try:
+                self.catalog.load_file(Config.STATION_CATALOG_PATH)
+            except Exception as e:
+                print(f"⚠️  Could not load station catalog {Config.STATION_CATALOG_PATH}: {e}")
     
     def search_gas_stations(self, location: Tuple[float, float], radius_miles: float = 5) -> List[Dict[str, Any]]:
         """
@@ -31,10 +54,181 @@ class MapService:
             List[Dict]: List of gas station data
         """
         if self.api_key:
-            return self._search_with_google_maps(location, radius_miles)
+            return self._search_with_tile_cache(location, radius_miles)
         else:
             return self._get_mock_stations(location, radius_miles)
     
+    def search_gas_stations_adaptive(self, location: Tuple[float, float], max_radius_miles: float,
+                                     is_enough: Callable[[List[Dict[str, Any]]], bool],
+                                     start_radius_miles: Optional[float] = None,
+                                     growth_factor: Optional[float] = None) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Search with a radius that grows geometrically until enough stations are found
+        
+        Each ring reuses what the inner rings cached: covered tiles are
+        answered locally and, where the area is dense, only the uncovered
+        outer sub-circles are fetched (see _search_with_tile_cache). Where the
+        stations found so far suggest a single query would hold everything
+        out to the maximum radius, the remaining rings are skipped.
+        
+        Args:
+            location: (latitude, longitude) tuple
+            max_radius_miles: Largest radius to search (the user's radius)
+            is_enough: Returns True once the stations found satisfy the caller
+            start_radius_miles: First radius tried (default: Config.ADAPTIVE_START_RADIUS_MILES)
+            growth_factor: Radius multiplier per ring (default: Config.ADAPTIVE_GROWTH_FACTOR)
+            
+        Returns:
+            Tuple: (stations from the last ring, radius it used)
+        """
+        growth_factor = max(growth_factor or Config.ADAPTIVE_GROWTH_FACTOR, 1.1)
+        radius = min(start_radius_miles or Config.ADAPTIVE_START_RADIUS_MILES, max_radius_miles)
+        
+        while True:
+            stations = self.search_gas_stations(location, radius)
+            if radius >= max_radius_miles or is_enough(stations):
+                return stations, radius
+            expected = len(stations) * (max_radius_miles / radius) ** 2
+            if expected < PLACES_PAGE_SIZE * Config.PLACES_MAX_PAGES / 2:
+                # Sparse area: one query covers the rest, so intermediate rings only add calls
+                radius = max_radius_miles
+            else:
+                radius = min(radius * growth_factor, max_radius_miles)
+    
+    def _search_with_tile_cache(self, location: Tuple[float, float], radius_miles: float) -> List[Dict[str, Any]]:
+        """
+        Search the station catalog, then the geo-tile cache, then Google Maps
+        
+        The catalog answers any circle it fully covers; its stations are
+        priced through the price cache. On a tile cache miss the upstream
+        search is run on a tile-snapped, padded circle so that the tiles
+        around the user are fully covered for the next query. When part of
+        that circle is already cached (an inner ring of an adaptive search,
+        or a neighbor's search), the cached tiles are used as they are and,
+        if they show the area is too dense for one query, only the
+        sub-circles over missing tiles are fetched.
+        
+        Args:
+            location: (latitude, longitude) tuple
+            radius_miles: Search radius in miles
+            
+        Returns:
+            List[Dict]: List of gas station data
+        """
+        known = self.catalog.lookup(location, radius_miles)
+        if known is not None:
+            return self._enrich_with_prices(self._localize_stations(known, location, radius_miles))
+        
+        cached = self.cache.lookup(location, radius_miles)
+        if cached is not None:
+            stations = self._localize_stations(cached, location, radius_miles)
+            if self.lazy_details:
+                # Pick up prices fetched since the tiles were cached (memory only)
+                self._enrich_with_prices(stations)
+            return stations
+        
+        search_center, search_radius = self.cache.search_circle(location, radius_miles)
+        cached, missing, tile_count = self.cache.partial_lookup(search_center, search_radius)
+        circles = self._uncovered_circles(search_center, search_radius, cached, missing, tile_count)
+        fetched = self._fetch_google_stations(search_center, search_radius, circles)
+        if fetched is None:
+            return self._get_mock_stations(location, radius_miles)
+        stations, covered = fetched
+        
+        # Tiles outside the circles that were searched completely stay uncached
+        if not circles:
+            self.cache.store(search_center, search_radius, stations, covered)
+            return self._localize_stations(stations, location, radius_miles)
+        
+        self.cache.store(search_center, search_radius, stations, covered, only_tiles=missing)
+        fetched_ids = {station.get('place_id') for station in stations if station.get('place_id')}
+        reused = [station for station in cached if station.get('place_id') not in fetched_ids]
+        localized = self._localize_stations(reused + stations, location, radius_miles)
+        if self.lazy_details:
+            self._enrich_with_prices(localized)
+        return localized
+    
+    def _uncovered_circles(self, location: Tuple[float, float], radius_miles: float,
+                           cached: List[Dict[str, Any]], missing: List[Any],
+                           tile_count: int) -> Optional[Tuple[Tuple[Tuple[float, float], float], ...]]:
+        """
+        Choose sub-circles that fetch only the uncached part of a search circle
+        
+        A single query costs one call however much of the circle is cached,
+        so sub-circles are only worth it when the cached tiles (holding at
+        least a page of stations, so the estimate means something) predict
+        more stations than one query returns; it would be truncated and split
+        anyway. The sub-circles are sized from the same density so that each
+        is expected to fill about half of one query.
+        
+        Args:
+            location: (latitude, longitude) of the search circle center
+            radius_miles: Search circle radius in miles
+            cached: Stations in the circle's cached tiles
+            missing: Tiles of the circle missing from the cache
+            tile_count: Number of tiles touching the circle
+            
+        Returns:
+            Optional[Tuple]: ((latitude, longitude), radius_miles) sub-circles
+            covering every missing tile, or None to query the whole circle
+        """
+        if not missing or len(missing) == tile_count or len(cached) < PLACES_PAGE_SIZE:
+            return None
+        capacity = PLACES_PAGE_SIZE * Config.PLACES_MAX_PAGES
+        expected = len(cached) / (1 - len(missing) / tile_count)
+        if expected < capacity:
+            return None
+        
+        density = expected / (math.pi * radius_miles ** 2)
+        cell_radius = math.sqrt(capacity / 2 / (math.pi * density))
+        cell_radius = min(max(cell_radius, Config.PLACES_MIN_SUBQUERY_RADIUS_MILES), radius_miles / 2)
+        missing = set(missing)
+        circles = []
+        for center in hex_cover(location[0], location[1], radius_miles, cell_radius * 0.95):
+            tiles = tiles_intersecting_circle(center[0], center[1], cell_radius, self.cache.tile_size_deg)
+            if missing.intersection(tiles):
+                circles.append((center, cell_radius))
+        return tuple(circles)
+    
+    def _localize_stations(self, stations: List[Dict[str, Any]], location: Tuple[float, float],
+                           radius_miles: float) -> List[Dict[str, Any]]:
+        """
+        Copy stations and recompute distance and travel time from the user location
+        
+        Args:
+            stations: Gas station data (not modified)
+            location: User's (latitude, longitude)
+            radius_miles: Stations farther than this are dropped
+            
+        Returns:
+            List[Dict]: Stations within the radius, nearest first
+        """
+        distances = haversine_one_to_many(
+            location[0], location[1],
+            [station['location']['latitude'] for station in stations],
+            [station['location']['longitude'] for station in stations]
+        )
+        
+        localized = []
+        for station, distance in zip(stations, distances.tolist()):
+            if distance > radius_miles:
+                continue
+            
+            station = self._copy_station(station)
+            station['distance_miles'] = round(distance, 1)
+            station['travel_time_minutes'] = int((distance / 40) * 60)  # Assume 40 mph
+            localized.append(station)
+        
+        localized.sort(key=lambda x: x['distance_miles'])
+        return localized
+    
+    def _copy_station(self, station: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a station dict so callers can modify it without touching shared results"""
+        station = dict(station)
+        station['location'] = dict(station['location'])
+        station['gas_prices'] = dict(station.get('gas_prices', {}))
+        return station
+    
     def _search_with_google_maps(self, location: Tuple[float, float], radius_miles: float) -> List[Dict[str, Any]]:
         """
         Search using Google Maps Places API
@@ -46,37 +240,101 @@ class MapService:
         Returns:
             List[Dict]: List of gas station data
         """
-        try:
-            # Convert miles to meters
-            radius_meters = int(radius_miles * 1609.34)
+        fetched = self._fetch_google_stations(location, radius_miles)
+        if fetched is None:
+            return self._get_mock_stations(location, radius_miles)
+        return [self._copy_station(station) for station in fetched[0]]
+    
+    def _fetch_google_stations(self, location: Tuple[float, float], radius_miles: float,
+                               circles: Optional[Tuple[Tuple[Tuple[float, float], float], ...]] = None
+                               ) -> Optional[Tuple[List[Dict[str, Any]], List[Tuple[Tuple[float, float], float]]]]:
+        """
+        Fetch and price gas stations from the Google Maps Places API
+        
+        Concurrent calls for the same search circle are coalesced into one
+        upstream search. The returned lists may be shared between callers and
+        must be copied before modification.
+        
+        Args:
+            location: (latitude, longitude) tuple
+            radius_miles: Search radius in miles
+            circles: Query only these sub-circles of the search circle
             
-            url = f"{self.base_url}/place/nearbysearch/json"
-            params = {
-                'location': f"{location[0]},{location[1]}",
-                'radius': radius_meters,
-                'type': 'gas_station',
-                'key': self.api_key
-            }
+        Returns:
+            Optional[Tuple]: (gas station data within the search circle,
+            ((latitude, longitude), radius_miles) circles whose results were
+            complete), or None if the API call failed. Parts of the search
+            circle outside every covered circle may be missing stations.
+        """
+        # Convert miles to meters
+        radius_meters = int(radius_miles * 1609.34)
+        key = ('nearbysearch', location[0], location[1], radius_meters, circles)
+        return single_flight.do(key, self._fetch_google_stations_uncoalesced, location, radius_meters, circles)
+    
+    def _fetch_google_stations_uncoalesced(self, location: Tuple[float, float], radius_meters: int,
+                                           circles: Optional[Tuple[Tuple[Tuple[float, float], float], ...]] = None
+                                           ) -> Optional[Tuple[List[Dict[str, Any]], List[Tuple[Tuple[float, float], float]]]]:
+        """Run the Places nearbysearch (paged, and split where truncated) and price the results"""
+        radius_miles = radius_meters / 1609.34
+        collected = self._collect_places(list(circles) if circles else [(location, radius_miles)])
+        if collected is None:
+            return None
+        places, complete, covered = collected
+        
+        # Sub-circles reach past the edge; don't price stations nobody asked for
+        distances = haversine_one_to_many(
+            location[0], location[1],
+            [place['geometry']['location']['lat'] for place in places],
+            [place['geometry']['location']['lng'] for place in places]
+        )
+        stations = []
+        for place, distance in zip(places, distances.tolist()):
+            if distance > radius_miles:
+                continue
+            station = self._parse_google_place(place, location)
+            if station:
+                stations.append(station)
+        stations = self._enrich_with_prices(stations)
+        
+        self.catalog.upsert_many(stations)
+        # Only result sets that weren't truncated prove a circle holds nothing else
+        if complete and not circles:
+            covered = [(location, radius_miles)]
+        for center, radius in covered:
+            # Stations outside the requested circle were dropped, so only inner circles count
+            if haversine_miles(location[0], location[1], center[0], center[1]) + radius <= radius_miles:
+                self.catalog.mark_covered(center, radius)
+        return stations, covered
+    
+    def _collect_places(self, circles: List[Tuple[Tuple[float, float], float]]
+                        ) -> Optional[Tuple[List[Dict[str, Any]], bool, List[Tuple[Tuple[float, float], float]]]]:
+        """
+        Collect raw Places results for circles, splitting wherever results may be truncated
+        
+        See PlacesCoverage for how circles are split and paged.
+        
+        Args:
+            circles: ((latitude, longitude), radius_miles) circles to cover
             
-            response = requests.get(url, params=params, timeout=10)
+        Returns:
+            Optional[Tuple]: (places deduplicated by place_id, whether every
+            circle is completely covered, the largest circles known to be
+            completely covered), or None if every first query failed
+        """
+        url = f"{self.base_url}/place/nearbysearch/json"
+        coverage = PlacesCoverage(lambda params: self._nearby_search_page(url, params), self.api_key,
+                                  self.places_executor)
+        return coverage.run(circles)
+    
+    def _nearby_search_page(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch one nearbysearch page, or None on a transport error"""
+        try:
+            response = http_client.get(url, params=params, timeout=10)
             response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') == 'OK':
-                stations = []
-                for place in data.get('results', []):
-                    station = self._parse_google_place(place, location)
-                    if station:
-                        stations.append(station)
-                return stations
-            else:
-                print(f"⚠️  Google Maps API error: {data.get('status')}")
-                return self._get_mock_stations(location, radius_miles)
-                
+            return response.json()
         except Exception as e:
             print(f"⚠️  Google Maps API error: {e}")
-            return self._get_mock_stations(location, radius_miles)
+            return None
     
     def _parse_google_place(self, place: Dict[str, Any], user_location: Tuple[float, float]) -> Optional[Dict[str, Any]]:
         """
@@ -114,11 +372,7 @@ class MapService:
             # Estimate travel time (assuming 40 mph average)
             travel_time = int((distance / 40) * 60)
             
-            # Get gas prices for different grades with source
-            price_data = gas_price_service.get_gas_prices_with_source(lat, lng, place.get('name', ''))
-            gas_prices = price_data['prices']
-            price = gas_prices.get('87', 3.80)  # Use regular (87) as default price
-            
+            # Prices are filled in afterwards by _enrich_with_prices
             return {
                 'name': place.get('name', 'Unknown Station'),
                 'location': {
@@ -126,20 +380,187 @@ class MapService:
                     'longitude': lng,
                     'address': place.get('vicinity', '')
                 },
-                'price_per_gallon': price,
-                'gas_prices': gas_prices,  # Include all fuel grades
+                'price_per_gallon': 3.80,
+                'gas_prices': {},  # Include all fuel grades
                 'price_source': 'Google Maps',  # Only Google Maps
                 'distance_miles': round(distance, 1),
                 'travel_time_minutes': travel_time,
                 'brand': self._extract_brand(place.get('name', '')),
                 'rating': place.get('rating'),
                 'address': place.get('vicinity', ''),
-                'place_id': place.get('place_id')
+                'place_id': place.get('place_id'),
+                'price_level': place.get('price_level')
             }
         except Exception as e:
             print(f"⚠️  Error parsing place: {e}")
             return None
     
+    def _enrich_with_prices(self, stations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fetch gas prices for all stations concurrently
+        
+        Stations with a place_id are priced through the place_id keyed API,
+        which goes straight to Place Details. Stations without one (bulk
+        catalog records) get their place_id from a cached location lookup,
+        which is written back to the catalog so the lookup isn't repeated;
+        those with no Google match keep their catalog prices or get an
+        estimate. Lookups run on a bounded thread pool
+        (Config.PRICE_LOOKUP_WORKERS wide), stations keep their original order,
+        and a failed lookup leaves that station with empty prices instead of
+        failing the whole search.
+        
+        In lazy mode (Config.LAZY_STATION_DETAILS) no request is made: each
+        station gets its cached prices, else keeps the prices it came with,
+        else gets an estimate, and fresh prices are fetched per station by
+        get_station_details when the user opens it.
+        
+        Args:
+            stations: Parsed gas station data
+            
+        Returns:
+            List[Dict]: The same stations with price fields filled in
+        """
+        if self.lazy_details:
+            for station in stations:
+                price_data = gas_price_service.get_cached_or_estimated_prices(
+                    station.get('place_id'), station.get('price_level')
+                )
+                # An estimate never replaces prices the station came with (bulk catalog)
+                if price_data['source'] != 'Estimated' or not station.get('gas_prices'):
+                    station['gas_prices'] = price_data['prices']
+                    station['price_source'] = price_data['source']
+                station['price_per_gallon'] = station['gas_prices'].get('87', 3.80)
+            return stations
+        
+        not_available = {'prices': {}, 'source': 'Not available'}
+        
+        place_ids = [station['place_id'] for station in stations if station.get('place_id')]
+        prices_by_place = gas_price_service.get_prices_for_place_ids(place_ids)
+        
+        def lookup_by_location(station: Dict[str, Any]) -> Optional[str]:
+            location = station['location']
+            return gas_price_service.find_place_id(location['latitude'], location['longitude'])
+        
+        unkeyed = [station for station in stations if not station.get('place_id')]
+        found_ids = bounded_map(
+            lookup_by_location, unkeyed, Config.PRICE_LOOKUP_WORKERS,
+            thread_name_prefix='place-lookup'
+        )
+        resolved = []
+        for station, place_id in zip(unkeyed, found_ids):
+            if place_id:
+                station['place_id'] = place_id
+                resolved.append(station)
+        if resolved:
+            prices_by_place.update(gas_price_service.get_prices_for_place_ids(
+                [station['place_id'] for station in resolved]
+            ))
+            # Keep the place_ids so later searches price these stations from the cache
+            self.catalog.upsert_many(resolved)
+        
+        for station in stations:
+            if station.get('place_id'):
+                price_data = prices_by_place.get(station['place_id'], not_available)
+                gas_prices = price_data['prices'] or station.get('gas_prices') or {}
+                if price_data['prices']:
+                    station['price_source'] = price_data['source']
+            elif station.get('gas_prices'):
+                gas_prices = station['gas_prices']  # Prices from the bulk catalog
+            else:
+                price_data = gas_price_service.get_cached_or_estimated_prices(None, station.get('price_level'))
+                gas_prices = price_data['prices']
+                station['price_source'] = price_data['source']
+            station['gas_prices'] = gas_prices
+            station['price_per_gallon'] = gas_prices.get('87', 3.80)  # Use regular (87) as default price
+        
+        return stations
+    
+    def get_station_details(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get full details and a fresh price for one station
+        
+        One Place Details call returns both; the details are cached for
+        Config.STATION_DETAILS_TTL_SECONDS and the prices go to the price
+        cache. No call is made while both caches are fresh.
+        
+        Args:
+            place_id: Google Places place_id of the station
+            
+        Returns:
+            Optional[Dict]: Station details with gas_prices, or None if unavailable
+        """
+        if not self.api_key or not place_id:
+            return None
+        
+        details = self.details_cache.get(place_id)
+        prices, is_stale = gas_price_service.get_cached_prices(place_id)
+        if details is None or not prices or is_stale:
+            result = single_flight.do(('place_details_full', place_id), self._fetch_place_details, place_id)
+            if result is not None:
+                details = self._parse_place_details(place_id, result)
+                self.details_cache.set(place_id, details)
+                prices = gas_price_service.record_place_details(place_id, result) or prices
+        
+        if details is None:
+            return None
+        
+        details = dict(details)
+        details['gas_prices'] = dict(prices or {})
+        details['price_per_gallon'] = details['gas_prices'].get('87', 3.80)
+        details['price_source'] = 'Google Maps' if prices else 'Not available'
+        return details
+    
+    def _fetch_place_details(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """Call Place Details for a station"""
+        try:
+            url = f"{self.base_url}/place/details/json"
+            params = {
+                'place_id': place_id,
+                'fields': ('name,formatted_address,formatted_phone_number,website,url,rating,'
+                           'user_ratings_total,price_level,opening_hours,editorial_summary,reviews'),
+                'key': self.api_key
+            }
+            
+            response = http_client.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            
+            data = response.json()
+            if data.get('status') == 'OK' and data.get('result'):
+                return data['result']
+            
+            print(f"⚠️  Place details error: {data.get('status')}")
+            return None
+            
+        except Exception as e:
+            print(f"⚠️  Place details error: {e}")
+            return None
+    
+    def _parse_place_details(self, place_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse a Place Details result into our format
+        
+        Args:
+            place_id: Google Places place_id of the station
+            result: Place Details result object
+            
+        Returns:
+            Dict: Station details
+        """
+        opening_hours = result.get('opening_hours') or {}
+        return {
+            'place_id': place_id,
+            'name': result.get('name', 'Unknown Station'),
+            'address': result.get('formatted_address', ''),
+            'phone': result.get('formatted_phone_number'),
+            'website': result.get('website'),
+            'maps_url': result.get('url'),
+            'rating': result.get('rating'),
+            'user_ratings_total': result.get('user_ratings_total'),
+            'open_now': opening_hours.get('open_now'),
+            'opening_hours': opening_hours.get('weekday_text', []),
+            'brand': self._extract_brand(result.get('name', ''))
+        }
+    
     def _get_mock_stations(self, location: Tuple[float, float], radius_miles: float) -> List[Dict[str, Any]]:
         """
         Generate mock gas station data for testing
@@ -209,26 +630,7 @@ class MapService:
         Returns:
             float: Distance in miles
         """
-        import math
-        
-        lat1, lon1 = point1
-        lat2, lon2 = point2
-        
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth's radius in miles
-        r = 3956
-        
-        return c * r
-    
-
+        return haversine_miles(point1[0], point1[1], point2[0], point2[1])
     
     def _extract_brand(self, station_name: str) -> str:
         """
@@ -268,7 +670,7 @@ class MapService:
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -315,6 +717,15 @@ def search_gas_stations(location: Tuple[float, float], radius_miles: float = 5)
     """Convenience function for searching gas stations"""
     return map_service.search_gas_stations(location, radius_miles)
 
+def search_gas_stations_adaptive(location: Tuple[float, float], max_radius_miles: float,
+                                 is_enough: Callable[[List[Dict[str, Any]]], bool]) -> Tuple[List[Dict[str, Any]], float]:
+    """Convenience function for searching with a growing radius"""
+    return map_service.search_gas_stations_adaptive(location, max_radius_miles, is_enough)
+
 def get_directions(origin: Tuple[float, float], destination: Tuple[float, float]) -> Dict[str, Any]:
     """Convenience function for getting directions"""
-    return map_service.get_directions(origin, destination) 
\ No newline at end of file
+    return map_service.get_directions(origin, destination) 
+
+def get_station_details(place_id: str) -> Optional[Dict[str, Any]]:
+    """Convenience function for getting station details"""
+    return map_service.get_station_details(place_id)
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""
+Places nearbysearch coverage for Gas Station Recommendation App
+"""
+
+import heapq
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import Config
+from utils.geo import SPLIT_RADIUS_RATIO, hex_cover, split_circle
+
+# Largest radius nearbysearch accepts (50 km)
+PLACES_MAX_RADIUS_MILES = 50000 / 1609.34
+
+# Results per nearbysearch page
+PLACES_PAGE_SIZE = 20
+
+Circle = Tuple[Tuple[float, float], float]
+
+class PlacesCoverage:
+    """
+    The nearbysearch queries of one search, covering a set of circles
+
+    Every circle is queried whole first. Once a circle's first page comes
+    back full with a next_page_token it may be truncated, so it is split
+    right away into seven overlapping sub-circles of a little over half its
+    radius (see split_circle), down to Config.PLACES_MIN_SUBQUERY_RADIUS_MILES. Those are queried while the
+    circle keeps paging. If the circle's pages turn out to hold everything,
+    its sub-circles that haven't been sent yet are dropped. Page-token
+    follow-ups are scheduled for when the token goes live instead of being
+    slept on, so executor threads only ever wait on HTTP, and the search
+    takes about as long as its slowest chain of pages.
+
+    At most Config.PLACES_MAX_SUBQUERIES circles are queried (each counts
+    once however many pages it takes) and at most
+    Config.PLACES_SUBQUERY_WORKERS requests are in flight at a time.
+    """
+
+    def __init__(self, fetch_page: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+                 api_key: str, executor: Executor):
+        """
+        Args:
+            fetch_page: Fetches one nearbysearch page for the given query
+                parameters, returning the JSON response or None on a
+                transport error
+            api_key: Google Maps API key
+            executor: Pool the page requests run on
+        """
+        self.fetch_page = fetch_page
+        self.api_key = api_key
+        self.executor = executor
+        self.budget = Config.PLACES_MAX_SUBQUERIES
+        self.limited = False
+        self.circles: List[Circle] = []
+        self.parents: List[Optional[int]] = []
+        self.children: List[List[int]] = []
+        self.answered: List[bool] = []  # First page came back
+        self.complete: List[bool] = []  # Every result of the circle was fetched
+        self.places: List[List[Dict[str, Any]]] = []
+        self._order = itertools.count()
+        self._ready = []  # (priority, order, request) heap of requests that can be sent
+        self._timers = []  # (send_at, order, request) heap of page-token follow-ups
+        self._in_flight: Dict[Future, Tuple[int, int, Dict[str, Any], bool]] = {}
+
+    def run(self, circles: List[Circle]) -> Optional[Tuple[List[Dict[str, Any]], bool, List[Circle]]]:
+        """
+        Query the circles, splitting wherever results may be truncated
+
+        Args:
+            circles: ((latitude, longitude), radius_miles) circles to cover
+
+        Returns:
+            Optional[Tuple]: (places deduplicated by place_id, whether every
+            circle is completely covered, the largest circles known to be
+            completely covered: ones whose results were not truncated, or
+            that were split and whose sub-circles all are), or None if every
+            first query failed
+        """
+        for center, radius in circles:
+            if radius > PLACES_MAX_RADIUS_MILES:
+                for cell in hex_cover(center[0], center[1], radius, PLACES_MAX_RADIUS_MILES * 0.95):
+                    self._add((cell, PLACES_MAX_RADIUS_MILES), None)
+            else:
+                self._add((center, radius), None)
+        roots = range(len(self.circles))
+
+        try:
+            while self._ready or self._timers or self._in_flight:
+                if all(self._covered(index) for index in roots):
+                    break
+                self._dispatch()
+                if not self._in_flight:
+                    if self._timers:
+                        time.sleep(max(self._timers[0][0] - time.monotonic(), 0))
+                    continue
+                timeout = max(self._timers[0][0] - time.monotonic(), 0) if self._timers else None
+                done, _ = wait(list(self._in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._receive(self._in_flight.pop(future), future.result())
+        finally:
+            for future in self._in_flight:
+                future.cancel()
+
+        if not any(self.answered[index] for index in roots):
+            return None
+
+        covered = []
+        stack = list(reversed(roots))
+        while stack:
+            index = stack.pop()
+            if self._covered(index):
+                covered.append(self.circles[index])
+            else:
+                stack += reversed(self.children[index])
+        complete = all(self._covered(index) for index in roots)
+        if self.limited and not complete:
+            print(f"⚠️  Places search reached {Config.PLACES_MAX_SUBQUERIES} queries; results may be incomplete")
+
+        merged = {}
+        for places in self.places:
+            for place in places:
+                merged.setdefault(place.get('place_id') or id(place), place)
+        return list(merged.values()), complete, covered
+
+    def _add(self, circle: Circle, parent: Optional[int]) -> None:
+        """Register a circle and queue its first page"""
+        index = len(self.circles)
+        self.circles.append(circle)
+        self.parents.append(parent)
+        self.children.append([])
+        self.answered.append(False)
+        self.complete.append(False)
+        self.places.append([])
+        if parent is not None:
+            self.children[parent].append(index)
+
+        center, radius = circle
+        params = {
+            'location': f"{center[0]},{center[1]}",
+            'radius': int(radius * 1609.34),
+            'type': 'gas_station',
+            'key': self.api_key
+        }
+        # Shallow circles first; they are the likeliest to settle their sub-circles
+        heapq.heappush(self._ready, (self._depth(index) + 1, next(self._order), (index, 0, params, False)))
+
+    def _depth(self, index: int) -> int:
+        depth = 0
+        while self.parents[index] is not None:
+            index = self.parents[index]
+            depth += 1
+        return depth
+
+    def _covered(self, index: int) -> bool:
+        """Whether a circle's results were complete, or all its sub-circles are covered"""
+        if self.complete[index]:
+            return True
+        children = self.children[index]
+        return bool(children) and all(self._covered(child) for child in children)
+
+    def _settled(self, index: int) -> bool:
+        """Whether a circle or one around it is already covered, making its queries redundant"""
+        while index is not None:
+            if self._covered(index):
+                return True
+            index = self.parents[index]
+        return False
+
+    def _dispatch(self) -> None:
+        """Send queued requests whose time has come, up to the in-flight limit"""
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, order, request = heapq.heappop(self._timers)
+            # Follow-ups go first: finishing a circle can make its sub-circles unnecessary
+            heapq.heappush(self._ready, (0, order, request))
+
+        while self._ready and len(self._in_flight) < Config.PLACES_SUBQUERY_WORKERS:
+            _, _, request = heapq.heappop(self._ready)
+            index, page = request[0], request[1]
+            if self._settled(index):
+                continue
+            if not page:
+                if self.budget <= 0:
+                    self.limited = True
+                    continue
+                self.budget -= 1
+            self._in_flight[self.executor.submit(self.fetch_page, request[2])] = request
+
+    def _receive(self, request: Tuple[int, int, Dict[str, Any], bool], data: Optional[Dict[str, Any]]) -> None:
+        """Record one page and decide whether to page on, split, or finish the circle"""
+        index, page, params, retried = request
+        status = data.get('status') if data is not None else None
+
+        if page and status == 'INVALID_REQUEST' and not retried:
+            # Token not live yet
+            self._schedule((index, page, params, True))
+            return
+        if not page and status == 'ZERO_RESULTS':
+            self.answered[index] = True
+            self.complete[index] = True
+            return
+        if status != 'OK':
+            if page:
+                # The pages already fetched are kept, but the rest is lost
+                self._split(index)
+            elif data is not None:
+                print(f"⚠️  Google Maps API error: {status}")
+            return
+
+        self.answered[index] = True
+        results = data.get('results', [])
+        self.places[index].extend(results)
+        token = data.get('next_page_token')
+        if token and page + 1 < Config.PLACES_MAX_PAGES:
+            self._schedule((index, page + 1, {'pagetoken': token, 'key': self.api_key}, False))
+            if len(results) >= PLACES_PAGE_SIZE:
+                self._split(index)
+        elif token or (page + 1 >= Config.PLACES_MAX_PAGES and len(results) >= PLACES_PAGE_SIZE):
+            # Google stops issuing tokens after the last page, so a full last page may be truncated
+            self._split(index)
+        else:
+            self.complete[index] = True
+
+    def _schedule(self, request: Tuple[int, int, Dict[str, Any], bool]) -> None:
+        """Queue a page-token request for when the token becomes valid"""
+        send_at = time.monotonic() + Config.PLACES_PAGE_TOKEN_DELAY_SECONDS
+        heapq.heappush(self._timers, (send_at, next(self._order), request))
+
+    def _split(self, index: int) -> None:
+        """Queue the seven overlapping sub-circles covering a circle"""
+        center, radius = self.circles[index]
+        cell_radius = radius * SPLIT_RADIUS_RATIO
+        if self.children[index] or cell_radius < Config.PLACES_MIN_SUBQUERY_RADIUS_MILES:
+            return
+        for cell in split_circle(center[0], center[1], radius):
+            self._add((cell, cell_radius), index)
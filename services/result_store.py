@@ -0,0 +1,67 @@
+"""
+Search result store for Gas Station Recommendation App
+"""
+
+import copy
+import secrets
+from typing import List, Dict, Any, Optional, Tuple
+from config import Config
+from utils.cache import TTLCache
+
+class ResultStore:
+    """
+    Server-side store of raw search results, addressed by an opaque handle
+
+    Holds the priced stations from a search (before filtering and ranking)
+    so they can be re-filtered and re-ranked with new parameters without
+    geocoding, searching or pricing again.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: Maximum result sets kept
+            ttl: Seconds a result set stays available
+        """
+        self.results = TTLCache(
+            max_entries=max_entries or Config.RESULT_STORE_MAX_ENTRIES,
+            ttl=ttl or Config.RESULT_STORE_TTL_SECONDS
+        )
+
+    def put(self, location: Tuple[float, float], stations: List[Dict[str, Any]]) -> str:
+        """
+        Store a search result
+
+        Args:
+            location: (latitude, longitude) the search was run for
+            stations: Priced stations, before filtering (copied)
+
+        Returns:
+            str: Handle for get()
+        """
+        handle = secrets.token_urlsafe(16)
+        self.results.set(handle, {'location': tuple(location), 'stations': copy.deepcopy(stations)})
+        return handle
+
+    def get(self, handle: str) -> Optional[Tuple[Tuple[float, float], List[Dict[str, Any]]]]:
+        """
+        Get a stored search result
+
+        Args:
+            handle: Handle returned by put()
+
+        Returns:
+            Optional[Tuple]: (location, stations), with stations deep-copied so
+            filtering can modify them, or None if unknown or expired
+        """
+        entry = self.results.get(handle)
+        if entry is None:
+            return None
+        return entry['location'], copy.deepcopy(entry['stations'])
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters for the store"""
+        return self.results.stats()
+
+# Global instance
+result_store = ResultStore()
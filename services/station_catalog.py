@@ -0,0 +1,420 @@
+"""
+Offline station catalog for Gas Station Recommendation App
+"""
+
+import csv
+import json
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from config import Config
+from utils.geo import (
+    Tile, haversine_miles, haversine_one_to_many, tile_for, tile_inside_circle,
+    tiles_intersecting_circle
+)
+from .station_catalog_file import MappedStationCatalog, to_stations
+
+# File suffix of compiled, memory-mapped catalogs
+MAPPED_CATALOG_SUFFIX = '.stcat'
+
+# Stations closer than this are treated as the same physical station
+SAME_STATION_MILES = 0.03
+
+def read_station_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Read stations from a CSV or GeoJSON file (e.g. an OSM amenity=fuel extract)
+
+    Args:
+        path: File path (.csv, .geojson or .json)
+
+    Returns:
+        List[Dict]: Stations in catalog form
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return list(_read_csv(path))
+    if suffix in ('.geojson', '.json'):
+        return list(_read_geojson(path))
+    raise ValueError(f"Unsupported station catalog format: {path}")
+
+def _read_csv(path: str) -> Iterable[Dict[str, Any]]:
+    """
+    Read stations from CSV
+
+    Expected columns: name, latitude (or lat), longitude (or lng/lon) and
+    optionally place_id, brand, address, rating, price_87, price_89, price_91.
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            lat = row.get('latitude') or row.get('lat')
+            lng = row.get('longitude') or row.get('lng') or row.get('lon')
+            if not lat or not lng:
+                continue
+            gas_prices = {
+                grade: float(row[f'price_{grade}'])
+                for grade in ('87', '89', '91') if row.get(f'price_{grade}')
+            }
+            yield {
+                'name': row.get('name') or 'Unknown Station',
+                'location': {'latitude': float(lat), 'longitude': float(lng), 'address': row.get('address', '')},
+                'brand': row.get('brand') or None,
+                'rating': float(row['rating']) if row.get('rating') else None,
+                'address': row.get('address', ''),
+                'place_id': row.get('place_id') or None,
+                'catalog_id': row.get('id') or None,
+                'gas_prices': gas_prices
+            }
+
+def _read_geojson(path: str) -> Iterable[Dict[str, Any]]:
+    """Read point features from a GeoJSON FeatureCollection"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    for feature in data.get('features', []):
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') != 'Point':
+            continue
+        lng, lat = geometry['coordinates'][:2]
+        props = feature.get('properties') or {}
+        address = props.get('address') or ' '.join(
+            part for part in (props.get('addr:housenumber'), props.get('addr:street')) if part
+        )
+        feature_id = feature.get('id') or props.get('@id') or props.get('id')
+        yield {
+            'name': props.get('name') or props.get('brand') or 'Unknown Station',
+            'location': {'latitude': float(lat), 'longitude': float(lng), 'address': address},
+            'brand': props.get('brand'),
+            'rating': props.get('rating'),
+            'address': address,
+            'place_id': props.get('place_id'),
+            'catalog_id': f"osm:{feature_id}" if feature_id else None,
+            'gas_prices': props.get('gas_prices') or {}
+        }
+
+class StationCatalog:
+    """
+    Local catalog of gas stations with a fixed-grid spatial index
+
+    Stations are bucketed into grid cells so radius queries only look at the
+    cells the circle touches. The catalog also tracks which cells are
+    covered, i.e. known to hold every station in them, so callers can tell
+    when a query can be answered without the Places API.
+    """
+
+    def __init__(self, cell_size_deg: Optional[float] = None, coverage_ttl: Optional[float] = None):
+        """
+        Args:
+            cell_size_deg: Grid cell edge length in degrees
+            coverage_ttl: Seconds a cell covered by a live search stays covered
+        """
+        self.cell_size_deg = cell_size_deg or Config.STATION_CATALOG_CELL_DEG
+        self.coverage_ttl = coverage_ttl or Config.STATION_CATALOG_COVERAGE_TTL_SECONDS
+        self._stations: Dict[str, Dict[str, Any]] = {}
+        self._cells: Dict[Tile, Set[str]] = {}
+        self._covered: Dict[Tile, float] = {}  # cell -> coverage expiry time
+        self._base: Optional[MappedStationCatalog] = None  # Shared read-only bulk catalog
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Count in-memory stations plus base file stations they don't supersede"""
+        with self._lock:
+            base = self._base
+            stations = list(self._stations.values())
+        if base is None:
+            return len(stations)
+        return len(stations) + len(base) - self._count_superseded(base, stations)
+
+    def stats(self) -> Dict[str, int]:
+        """Get station, cell and covered-cell counts"""
+        with self._lock:
+            return {
+                'stations': len(self._stations),
+                'cells': len(self._cells),
+                'covered_cells': len(self._covered),
+                'mapped_stations': len(self._base) if self._base is not None else 0
+            }
+
+    # Queries
+
+    def lookup(self, location: Tuple[float, float], radius_miles: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a radius query from the catalog if it covers the whole circle
+
+        Args:
+            location: (latitude, longitude) of the query center
+            radius_miles: Query radius in miles
+
+        Returns:
+            Optional[List[Dict]]: Catalog records within the radius, or None if
+            any cell touched by the circle is not covered
+        """
+        cells = tiles_intersecting_circle(location[0], location[1], radius_miles, self.cell_size_deg)
+        now = time.time()
+        with self._lock:
+            base = self._base
+            if not all(self._covered.get(cell, 0) > now for cell in cells):
+                if base is None or not base.covers(
+                    [cell for cell in cells if self._covered.get(cell, 0) <= now]
+                ):
+                    return None
+            candidates = [self._stations[key] for cell in cells for key in self._cells.get(cell, ())]
+        return self._merge_base(self._within_radius(candidates, location, radius_miles), location, radius_miles, cells)
+
+    def query_radius(self, location: Tuple[float, float], radius_miles: float) -> List[Dict[str, Any]]:
+        """
+        Find catalog stations within a radius, covered or not
+
+        Args:
+            location: (latitude, longitude) of the query center
+            radius_miles: Query radius in miles
+
+        Returns:
+            List[Dict]: Catalog records within the radius (shared; copy before modifying)
+        """
+        cells = tiles_intersecting_circle(location[0], location[1], radius_miles, self.cell_size_deg)
+        with self._lock:
+            candidates = [self._stations[key] for cell in cells for key in self._cells.get(cell, ())]
+        return self._merge_base(self._within_radius(candidates, location, radius_miles), location, radius_miles, cells)
+
+    # Updates
+
+    def upsert(self, station: Dict[str, Any]) -> str:
+        """
+        Add or update a station
+
+        Google stations are keyed by place_id. A Google station replaces any
+        unkeyed (bulk-loaded) record at the same spot.
+
+        Args:
+            station: Gas station data with location.latitude/longitude
+
+        Returns:
+            str: Catalog key of the station
+        """
+        record = self._to_record(station)
+        lat = record['location']['latitude']
+        lng = record['location']['longitude']
+        key = record['place_id'] or record.get('catalog_id') or f"{lat:.6f},{lng:.6f}"
+
+        with self._lock:
+            if record['place_id']:
+                for other_key in self._nearby_unkeyed(lat, lng):
+                    self._remove(other_key)
+
+            if key in self._stations:
+                previous = self._stations[key]
+                # Keep known prices if the update doesn't carry any
+                if not record['gas_prices'] and previous.get('gas_prices'):
+                    record['gas_prices'] = previous['gas_prices']
+                    record['price_per_gallon'] = previous.get('price_per_gallon')
+                self._remove(key)
+
+            self._stations[key] = record
+            self._cells.setdefault(tile_for(lat, lng, self.cell_size_deg), set()).add(key)
+        return key
+
+    def upsert_many(self, stations: Iterable[Dict[str, Any]]) -> int:
+        """Upsert several stations; returns how many were processed"""
+        count = 0
+        for station in stations:
+            self.upsert(station)
+            count += 1
+        return count
+
+    def mark_covered(self, location: Tuple[float, float], radius_miles: float, ttl: Optional[float] = None) -> None:
+        """
+        Mark the cells lying entirely inside a searched circle as covered
+
+        Args:
+            location: (latitude, longitude) of the search center
+            radius_miles: Search radius in miles
+            ttl: Seconds the coverage lasts (default: coverage_ttl)
+        """
+        expires_at = time.time() + (self.coverage_ttl if ttl is None else ttl)
+        with self._lock:
+            for cell in tiles_intersecting_circle(location[0], location[1], radius_miles, self.cell_size_deg):
+                if tile_inside_circle(cell, self.cell_size_deg, location[0], location[1], radius_miles):
+                    self._covered[cell] = max(self._covered.get(cell, 0), expires_at)
+
+    def mark_bounds_covered(self, south: float, west: float, north: float, east: float) -> None:
+        """Mark every cell inside a bounding box as permanently covered"""
+        min_row, min_col = tile_for(south, west, self.cell_size_deg)
+        max_row, max_col = tile_for(north, east, self.cell_size_deg)
+        with self._lock:
+            # Edge cells are only partly inside the box, so they stay uncovered
+            for row in range(min_row + 1, max_row):
+                for col in range(min_col + 1, max_col):
+                    self._covered[(row, col)] = float('inf')
+
+    # Bulk loading
+
+    def load_file(self, path: str, mark_covered: bool = True) -> int:
+        """
+        Load stations from a CSV or GeoJSON file (e.g. an OSM amenity=fuel extract)
+
+        Compiled catalog files (.stcat) are memory-mapped instead of loaded.
+
+        Args:
+            path: File path (.csv, .geojson, .json or .stcat)
+            mark_covered: Treat the file as complete for its bounding box
+
+        Returns:
+            int: Number of stations loaded
+        """
+        if Path(path).suffix.lower() == MAPPED_CATALOG_SUFFIX:
+            return self.attach_file(path)
+
+        stations = read_station_file(path)
+        count = self.upsert_many(stations)
+        if mark_covered and stations:
+            lats = [s['location']['latitude'] for s in stations]
+            lngs = [s['location']['longitude'] for s in stations]
+            self.mark_bounds_covered(min(lats), min(lngs), max(lats), max(lngs))
+
+        print(f"✅ Loaded {count} stations into the catalog from {path}")
+        return count
+
+    def attach_file(self, path: str) -> int:
+        """
+        Use a compiled catalog file as the read-only base of this catalog
+
+        The file is memory-mapped, so every worker process shares one copy.
+        Stations seen since are kept in memory on top of it.
+
+        Args:
+            path: Catalog file built by build_catalog_file
+
+        Returns:
+            int: Number of stations in the file
+        """
+        base = MappedStationCatalog(path)
+        with self._lock:
+            if base.cell_size_deg != self.cell_size_deg:
+                if self._stations or self._covered:
+                    raise ValueError(
+                        f"Catalog file cell size {base.cell_size_deg} doesn't match {self.cell_size_deg}"
+                    )
+                self.cell_size_deg = base.cell_size_deg
+            self._base = base
+        return len(base)
+
+    # Internals
+
+    def _merge_base(self, local: List[Dict[str, Any]], location: Tuple[float, float],
+                    radius_miles: float, cells: List[Tile]) -> List[Dict[str, Any]]:
+        """Add base file stations not superseded by in-memory records"""
+        base = self._base
+        if base is None:
+            return local
+        mapped = base.query_radius(location, radius_miles, cells)
+        if not local:
+            return mapped
+
+        local_ids = {station['place_id'] for station in local if station['place_id']}
+        local_ids.update(station['catalog_id'] for station in local if station.get('catalog_id'))
+        keyed = [station for station in local if station['place_id']]
+
+        merged = list(local)
+        for station in mapped:
+            if station['place_id'] in local_ids or station['catalog_id'] in local_ids:
+                continue
+            if not station['place_id'] and keyed and haversine_one_to_many(
+                station['location']['latitude'], station['location']['longitude'],
+                [other['location']['latitude'] for other in keyed],
+                [other['location']['longitude'] for other in keyed]
+            ).min() <= SAME_STATION_MILES:
+                continue
+            merged.append(station)
+        return merged
+
+    def _count_superseded(self, base: MappedStationCatalog, local: List[Dict[str, Any]]) -> int:
+        """Count base file stations that _merge_base would drop in favor of in-memory records"""
+        local_ids = set()
+        keyed_by_cell: Dict[Tile, List[Tuple[float, float]]] = {}
+        for station in local:
+            local_ids.update(key for key in (station['place_id'], station.get('catalog_id')) if key)
+            if station['place_id']:
+                point = (station['location']['latitude'], station['location']['longitude'])
+                keyed_by_cell.setdefault(tile_for(point[0], point[1], self.cell_size_deg), []).append(point)
+
+        cells = set()
+        for station in local:
+            cells.update(tiles_intersecting_circle(
+                station['location']['latitude'], station['location']['longitude'],
+                SAME_STATION_MILES, self.cell_size_deg
+            ))
+        if not cells:
+            return 0
+
+        count = 0
+        for station in to_stations(base.query_cells(list(cells))):
+            if station['place_id'] in local_ids or station['catalog_id'] in local_ids:
+                count += 1
+            elif not station['place_id']:
+                lat, lng = station['location']['latitude'], station['location']['longitude']
+                if any(
+                    haversine_miles(lat, lng, other[0], other[1]) <= SAME_STATION_MILES
+                    for cell in tiles_intersecting_circle(lat, lng, SAME_STATION_MILES, self.cell_size_deg)
+                    for other in keyed_by_cell.get(cell, ())
+                ):
+                    count += 1
+        return count
+
+    def _within_radius(self, candidates: List[Dict[str, Any]], location: Tuple[float, float],
+                       radius_miles: float) -> List[Dict[str, Any]]:
+        """Keep the candidates within radius_miles of location"""
+        if not candidates:
+            return []
+        distances = haversine_one_to_many(
+            location[0], location[1],
+            [station['location']['latitude'] for station in candidates],
+            [station['location']['longitude'] for station in candidates]
+        )
+        return [station for station, distance in zip(candidates, distances) if distance <= radius_miles]
+
+    def _to_record(self, station: Dict[str, Any]) -> Dict[str, Any]:
+        """Strip per-user fields and copy a station into catalog form"""
+        location = station['location']
+        gas_prices = dict(station.get('gas_prices') or {})
+        return {
+            'name': station.get('name', 'Unknown Station'),
+            'location': {
+                'latitude': float(location['latitude']),
+                'longitude': float(location['longitude']),
+                'address': location.get('address', station.get('address', ''))
+            },
+            'price_per_gallon': gas_prices.get('87', station.get('price_per_gallon')),
+            'gas_prices': gas_prices,
+            'brand': station.get('brand'),
+            'rating': station.get('rating'),
+            'address': station.get('address', location.get('address', '')),
+            'price_source': station.get('price_source', 'Catalog'),
+            'place_id': station.get('place_id'),
+            'catalog_id': station.get('catalog_id')
+        }
+
+    def _nearby_unkeyed(self, latitude: float, longitude: float) -> List[str]:
+        """Keys of records without a place_id at (almost) the same spot"""
+        keys = []
+        for cell in tiles_intersecting_circle(latitude, longitude, SAME_STATION_MILES, self.cell_size_deg):
+            for key in self._cells.get(cell, ()):
+                record = self._stations[key]
+                if record['place_id']:
+                    continue
+                if haversine_miles(latitude, longitude, record['location']['latitude'],
+                                   record['location']['longitude']) <= SAME_STATION_MILES:
+                    keys.append(key)
+        return keys
+
+    def _remove(self, key: str) -> None:
+        record = self._stations.pop(key)
+        cell = tile_for(record['location']['latitude'], record['location']['longitude'], self.cell_size_deg)
+        keys = self._cells.get(cell)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+# Global instance
+station_catalog = StationCatalog()
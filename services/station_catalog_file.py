@@ -0,0 +1,320 @@
+"""
+Memory-mapped station catalog file for Gas Station Recommendation App
+
+File layout (little endian):
+
+    magic        8 bytes   b'STCAT\\x00\\x01\\x00'
+    header_size  uint32    length of the JSON header
+    header       JSON      cell size, record count, covered cell range, dtype
+    padding                up to a 64 byte boundary
+    cell_keys    int64[n]  sorted grid cell key of every record
+    records      STATION_DTYPE[n], in cell_keys order
+
+Workers open the file with np.memmap, so the OS page cache holds a single
+copy shared by every process and opening it only reads the header.
+"""
+
+import argparse
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from config import Config
+from models.station_batch import FUEL_GRADES
+from utils.geo import Tile, haversine_one_to_many, tile_for, tiles_intersecting_circle
+
+MAGIC = b'STCAT\x00\x01\x00'
+HEADER_ALIGNMENT = 64
+
+STATION_DTYPE = np.dtype([
+    ('place_id', 'S64'),
+    ('catalog_id', 'S32'),
+    ('name', 'S96'),
+    ('brand', 'S32'),
+    ('address', 'S128'),
+    ('latitude', '<f8'),
+    ('longitude', '<f8'),
+    ('rating', '<f4'),  # NaN if unknown
+] + [(f'price_{grade}', '<f4') for grade in FUEL_GRADES] + [  # NaN if unknown
+    ('updated', '<f8'),  # Unix time the prices were last seen
+])
+
+def cell_key(row: int, col: int) -> int:
+    """Pack a grid cell into an int64 that sorts row-major"""
+    return row * (1 << 32) + (col + (1 << 31))
+
+def _encode(value: Optional[str], width: int) -> bytes:
+    # Cut at the field width; a split UTF-8 sequence is dropped on decode
+    return (value or '').encode('utf-8')[:width]
+
+def _decode(value: bytes) -> Optional[str]:
+    return value.decode('utf-8', 'ignore') or None
+
+def build_catalog_file(stations: List[Dict[str, Any]], path: str, cell_size_deg: Optional[float] = None) -> int:
+    """
+    Compile stations into a catalog file and atomically swap it into place
+
+    Readers holding the previous version keep using it until they notice
+    the new file; a partially written file is never visible at `path`.
+
+    Args:
+        stations: Stations in catalog form (see read_station_file)
+        path: Output file path
+        cell_size_deg: Grid cell edge length in degrees
+
+    Returns:
+        int: Number of records written
+    """
+    cell_size_deg = cell_size_deg or Config.STATION_CATALOG_CELL_DEG
+    now = time.time()
+
+    records = np.zeros(len(stations), dtype=STATION_DTYPE)
+    for field in ('place_id', 'catalog_id', 'name', 'brand', 'address'):
+        width = STATION_DTYPE[field].itemsize
+        records[field] = [_encode(station.get(field), width) for station in stations]
+    records['latitude'] = [float(station['location']['latitude']) for station in stations]
+    records['longitude'] = [float(station['location']['longitude']) for station in stations]
+    records['rating'] = [np.nan if station.get('rating') is None else station['rating'] for station in stations]
+    for grade in FUEL_GRADES:
+        records[f'price_{grade}'] = [
+            np.nan if (station.get('gas_prices') or {}).get(grade) is None else station['gas_prices'][grade]
+            for station in stations
+        ]
+    records['updated'] = [station.get('updated') or now for station in stations]
+
+    keys = np.array([
+        cell_key(*tile_for(lat, lng, cell_size_deg))
+        for lat, lng in zip(records['latitude'].tolist(), records['longitude'].tolist())
+    ], dtype='<i8')
+
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    records = records[order]
+
+    covered = None
+    if len(stations):
+        # The file is complete for its bounding box; edge cells are only partly inside it
+        min_row, min_col = tile_for(float(records['latitude'].min()), float(records['longitude'].min()), cell_size_deg)
+        max_row, max_col = tile_for(float(records['latitude'].max()), float(records['longitude'].max()), cell_size_deg)
+        covered = [min_row + 1, min_col + 1, max_row - 1, max_col - 1]
+
+    header = json.dumps({
+        'cell_size_deg': cell_size_deg,
+        'count': len(stations),
+        'covered': covered,
+        'built_at': now,
+        'dtype': STATION_DTYPE.descr
+    }).encode('utf-8')
+    prefix = MAGIC + struct.pack('<I', len(header)) + header
+    prefix += b'\x00' * (-len(prefix) % HEADER_ALIGNMENT)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(prefix)
+            f.write(keys.tobytes())
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(stations)
+
+def to_stations(records: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Convert catalog records into station dicts in catalog form
+
+    Args:
+        records: STATION_DTYPE records
+
+    Returns:
+        List[Dict]: One station per record
+    """
+    price_fields = [STATION_DTYPE.names.index(f'price_{grade}') for grade in FUEL_GRADES]
+    stations = []
+    for values in records.tolist():
+        record = dict(zip(STATION_DTYPE.names, values))
+        gas_prices = {
+            grade: round(values[i], 3)
+            for grade, i in zip(FUEL_GRADES, price_fields) if values[i] == values[i]  # skip NaN
+        }
+        address = _decode(record['address']) or ''
+        stations.append({
+            'name': _decode(record['name']) or 'Unknown Station',
+            'location': {'latitude': record['latitude'], 'longitude': record['longitude'], 'address': address},
+            'price_per_gallon': gas_prices.get('87'),
+            'gas_prices': gas_prices,
+            'brand': _decode(record['brand']),
+            'rating': round(record['rating'], 1) if record['rating'] == record['rating'] else None,
+            'address': address,
+            'price_source': 'Catalog',
+            'place_id': _decode(record['place_id']),
+            'catalog_id': _decode(record['catalog_id']),
+            'updated': record['updated']
+        })
+    return stations
+
+class MappedStationCatalog:
+    """
+    Read-only station catalog backed by a memory-mapped catalog file
+
+    The file is re-opened when a new version has been swapped in (checked at
+    most every reload_interval seconds); old maps are released once no
+    query is using them.
+    """
+
+    def __init__(self, path: str, reload_interval: Optional[float] = None):
+        """
+        Args:
+            path: Catalog file built by build_catalog_file
+            reload_interval: Seconds between checks for a new file version
+        """
+        self.path = path
+        self.reload_interval = Config.STATION_CATALOG_RELOAD_SECONDS if reload_interval is None else reload_interval
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._identity = None
+        self._mapped = None
+        self._open()
+
+    def __len__(self) -> int:
+        return self._current()['count']
+
+    def covers(self, cells: List[Tile]) -> bool:
+        """Check whether the file is known to hold every station in all of the cells"""
+        covered = self._current()['covered']
+        return covered is not None and all(
+            covered[0] <= row <= covered[2] and covered[1] <= col <= covered[3] for row, col in cells
+        )
+
+    def query_cells(self, cells: List[Tile]) -> np.ndarray:
+        """
+        Get the records in a set of cells
+
+        Args:
+            cells: Grid cells (computed with this file's cell size)
+
+        Returns:
+            np.ndarray: Matching STATION_DTYPE records (a copy, detached from the map)
+        """
+        return self._query_cells(self._current(), cells)
+
+    def _query_cells(self, mapped: Dict[str, Any], cells: List[Tile]) -> np.ndarray:
+        keys, records = mapped['keys'], mapped['records']
+
+        # Cells in the same row are one contiguous key range
+        col_ranges: Dict[int, Tuple[int, int]] = {}
+        for row, col in cells:
+            low, high = col_ranges.get(row, (col, col))
+            col_ranges[row] = (min(low, col), max(high, col))
+
+        chunks = []
+        for row, (low, high) in col_ranges.items():
+            start = np.searchsorted(keys, cell_key(row, low), side='left')
+            end = np.searchsorted(keys, cell_key(row, high), side='right')
+            if end > start:
+                chunks.append(records[start:end])
+        if not chunks:
+            return np.empty(0, dtype=STATION_DTYPE)
+        return np.concatenate(chunks)
+
+    def query_radius(self, location: Tuple[float, float], radius_miles: float,
+                     cells: Optional[List[Tile]] = None) -> List[Dict[str, Any]]:
+        """
+        Find stations within a radius
+
+        Args:
+            location: (latitude, longitude) of the query center
+            radius_miles: Query radius in miles
+            cells: Cells touched by the circle, if already known
+
+        Returns:
+            List[Dict]: Stations in catalog form
+        """
+        mapped = self._current()
+        if cells is None:
+            cells = tiles_intersecting_circle(location[0], location[1], radius_miles, mapped['cell_size_deg'])
+        records = self._query_cells(mapped, cells)
+        if not len(records):
+            return []
+        distances = haversine_one_to_many(location[0], location[1], records['latitude'], records['longitude'])
+        return to_stations(records[distances <= radius_miles])
+
+    @property
+    def cell_size_deg(self) -> float:
+        return self._current()['cell_size_deg']
+
+    def _current(self) -> Dict[str, Any]:
+        """Get the current map, re-opening the file if a new version was swapped in"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._next_check = now + self.reload_interval
+                    try:
+                        stat = os.stat(self.path)
+                        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._identity:
+                            self._open()
+                    except Exception as e:
+                        print(f"⚠️  Could not reload station catalog {self.path}: {e}")
+        return self._mapped
+
+    def _open(self) -> None:
+        with open(self.path, 'rb') as f:
+            # Map through the open handle so a concurrent swap can't mix two versions
+            stat = os.fstat(f.fileno())
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a station catalog file: {self.path}")
+            (header_size,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+            if np.dtype([tuple(field) for field in header['dtype']]) != STATION_DTYPE:
+                raise ValueError(f"Station catalog {self.path} was built with a different record format")
+            if self._mapped is not None and header['cell_size_deg'] != self._mapped['cell_size_deg']:
+                raise ValueError(f"Station catalog {self.path} was rebuilt with a different cell size")
+
+            count = header['count']
+            offset = len(MAGIC) + 4 + header_size
+            offset += -offset % HEADER_ALIGNMENT
+            if count:
+                keys = np.memmap(f, dtype='<i8', mode='r', offset=offset, shape=(count,))
+                records = np.memmap(f, dtype=STATION_DTYPE, mode='r', offset=offset + keys.nbytes, shape=(count,))
+            else:
+                keys = np.empty(0, dtype='<i8')
+                records = np.empty(0, dtype=STATION_DTYPE)
+
+        # Swap the whole map in one assignment so queries never see a mix of versions
+        self._mapped = {
+            'keys': keys,
+            'records': records,
+            'count': count,
+            'cell_size_deg': header['cell_size_deg'],
+            'covered': header['covered']
+        }
+        self._identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        print(f"✅ Mapped {count} stations from {self.path}")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line builder: compile a CSV/GeoJSON station file into a catalog file"""
+    from .station_catalog import read_station_file
+
+    parser = argparse.ArgumentParser(description='Build a memory-mapped station catalog file')
+    parser.add_argument('source', help='CSV or GeoJSON station file')
+    parser.add_argument('output', help='Catalog file to write (replaced atomically)')
+    parser.add_argument('--cell-size', type=float, default=None, help='Grid cell size in degrees')
+    args = parser.parse_args(argv)
+
+    stations = read_station_file(args.source)
+    count = build_catalog_file(stations, args.output, args.cell_size)
+    print(f"✅ Wrote {count} stations to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Geo-tile station cache for Gas Station Recommendation App
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config import Config
+from utils.cache import TTLCache
+from utils.geo import (
+    Tile, haversine_one_to_many, tile_center, tile_diagonal_miles, tile_for,
+    tile_inside_circle, tiles_intersecting_circle
+)
+
+class StationTileCache:
+    """
+    Cache of station search results bucketed by fixed-size geo tiles
+
+    A tile is only stored once a search circle has covered it completely, so
+    any query whose circle touches nothing but cached tiles can be answered
+    locally.
+    """
+
+    def __init__(self, tile_size_deg: Optional[float] = None, ttl: Optional[float] = None,
+                 max_tiles: Optional[int] = None):
+        self.tile_size_deg = tile_size_deg or Config.STATION_TILE_SIZE_DEG
+        self.tiles = TTLCache(
+            max_entries=max_tiles or Config.STATION_TILE_CACHE_MAX_TILES,
+            ttl=ttl or Config.STATION_TILE_CACHE_TTL_SECONDS
+        )
+
+    def lookup(self, location: Tuple[float, float], radius_miles: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a radius query from cached tiles
+
+        Args:
+            location: (latitude, longitude) of the query center
+            radius_miles: Query radius in miles
+
+        Returns:
+            Optional[List[Dict]]: Stations within the radius (deduplicated by
+            place_id), or None if any covering tile is missing or expired
+        """
+        stations_by_id = {}
+        for tile in tiles_intersecting_circle(location[0], location[1], radius_miles, self.tile_size_deg):
+            tile_stations = self.tiles.get(tile)
+            if tile_stations is None:
+                return None
+            for station in tile_stations:
+                key = station.get('place_id') or (station['location']['latitude'], station['location']['longitude'])
+                stations_by_id[key] = station
+
+        candidates = list(stations_by_id.values())
+        distances = haversine_one_to_many(
+            location[0], location[1],
+            [station['location']['latitude'] for station in candidates],
+            [station['location']['longitude'] for station in candidates]
+        )
+        return [station for station, distance in zip(candidates, distances) if distance <= radius_miles]
+
+    def partial_lookup(self, location: Tuple[float, float],
+                       radius_miles: float) -> Tuple[List[Dict[str, Any]], List[Tile], int]:
+        """
+        Split a circle into what the cache already holds and what it lacks
+
+        Args:
+            location: (latitude, longitude) of the circle center
+            radius_miles: Circle radius in miles
+
+        Returns:
+            Tuple: (stations in the cached tiles, deduplicated by place_id and
+            not filtered by distance, tiles missing from the cache, number of
+            tiles touching the circle)
+        """
+        stations_by_id = {}
+        missing = []
+        tiles = tiles_intersecting_circle(location[0], location[1], radius_miles, self.tile_size_deg)
+        for tile in tiles:
+            tile_stations = self.tiles.get(tile)
+            if tile_stations is None:
+                missing.append(tile)
+                continue
+            for station in tile_stations:
+                key = station.get('place_id') or (station['location']['latitude'], station['location']['longitude'])
+                stations_by_id[key] = station
+        return list(stations_by_id.values()), missing, len(tiles)
+
+    def search_circle(self, location: Tuple[float, float], radius_miles: float) -> Tuple[Tuple[float, float], float]:
+        """
+        Get the network search circle that fills the cache for a query
+
+        The center is snapped to its tile center and the radius padded so that
+        every tile touching the original query circle ends up fully covered.
+        Nearby users then share the same upstream search and cached tiles.
+
+        Args:
+            location: (latitude, longitude) of the query center
+            radius_miles: Query radius in miles
+
+        Returns:
+            Tuple: ((latitude, longitude), radius_miles) to search
+        """
+        center = tile_center(tile_for(location[0], location[1], self.tile_size_deg), self.tile_size_deg)
+        padding = 1.5 * tile_diagonal_miles(center[0], self.tile_size_deg)
+        return center, radius_miles + padding
+
+    def store(self, location: Tuple[float, float], radius_miles: float, stations: List[Dict[str, Any]],
+              covered: Optional[Iterable[Tuple[Tuple[float, float], float]]] = None,
+              only_tiles: Optional[Iterable[Tile]] = None) -> None:
+        """
+        Cache the result of a search circle
+
+        Only tiles entirely inside the circle, and inside one of the circles
+        the search covered completely, are stored, including empty ones.
+        Tiles a truncated or failed query left short are not cached.
+
+        Args:
+            location: (latitude, longitude) of the search center
+            radius_miles: Search radius in miles
+            stations: Stations returned for the search
+            covered: ((latitude, longitude), radius_miles) circles whose results
+                were complete (default: the whole search circle)
+            only_tiles: Restrict storing to these tiles (the ones actually searched)
+        """
+        covered = [(location, radius_miles)] if covered is None else list(covered)
+        allowed = None if only_tiles is None else set(only_tiles)
+        buckets = {}
+        for tile in tiles_intersecting_circle(location[0], location[1], radius_miles, self.tile_size_deg):
+            if allowed is not None and tile not in allowed:
+                continue
+            if not tile_inside_circle(tile, self.tile_size_deg, location[0], location[1], radius_miles):
+                continue
+            if any(tile_inside_circle(tile, self.tile_size_deg, center[0], center[1], radius)
+                   for center, radius in covered):
+                buckets[tile] = []
+
+        for station in stations:
+            tile = tile_for(station['location']['latitude'], station['location']['longitude'], self.tile_size_deg)
+            if tile in buckets:
+                buckets[tile].append(station)
+
+        for tile, tile_stations in buckets.items():
+            self.tiles.set(tile, tuple(tile_stations))
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters for the tile cache"""
+        return self.tiles.stats()
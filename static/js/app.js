@@ -34,6 +34,13 @@ class GasStationApp {
         document.getElementById('tankSize').addEventListener('input', () => {
             this.calculateFuelNeeded();
         });
+
+        // Switch fuel grade on the current results without a new search
+        document.getElementById('fuelGrade').addEventListener('change', () => {
+            if (this.lastResult) {
+                this.displayResults(this.lastResult, false);
+            }
+        });
     }
 
     initializeMap() {
@@ -199,27 +206,20 @@ class GasStationApp {
             });
 
             // Create info window content
-            const fuelGrade = document.getElementById('fuelGrade').value;
-            const gasPrices = station.gas_prices || {};
-            const selectedPrice = gasPrices[fuelGrade] || station.price_per_gallon;
-            
-            const infoContent = `
-                <div style="padding: 10px; min-width: 200px;">
-                    <h6><i class="fas fa-gas-pump text-success"></i> ${station.name}</h6>
-                    <p class="mb-1"><strong>Price:</strong> $${selectedPrice.toFixed(2)}/gallon</p>
-                    <p class="mb-1"><strong>Distance:</strong> ${formatDistance(station.distance_miles)}</p>
-                    <p class="mb-1"><strong>Travel Time:</strong> ${formatTime(station.travel_time_minutes)}</p>
-                    <p class="mb-0"><strong>Address:</strong> ${station.location?.address || station.address || 'Address not available'}</p>
-                    ${isAIRecommended ? '<div class="mt-2"><span class="badge bg-warning text-dark"><i class="fas fa-star"></i> RECOMMENDED</span></div>' : ''}
-                </div>
-            `;
-
             const infoWindow = new google.maps.InfoWindow({
-                content: infoContent
+                content: this.buildStationInfo(station, isAIRecommended)
             });
 
             marker.addListener('click', () => {
                 infoWindow.open(this.map, marker);
+                if (this.lazyStationDetails && station.place_id) {
+                    // Details and a fresh price are only fetched for stations the user opens
+                    this.loadStationDetails(station.place_id).then(details => {
+                        if (details) {
+                            infoWindow.setContent(this.buildStationInfo(station, isAIRecommended, details));
+                        }
+                    });
+                }
             });
 
             this.markers.push(marker);
@@ -243,11 +243,54 @@ class GasStationApp {
         }
     }
 
+    buildStationInfo(station, isAIRecommended, details = null) {
+        const fuelGrade = document.getElementById('fuelGrade').value;
+        const gasPrices = (details && details.gas_prices) || station.gas_prices || {};
+        const selectedPrice = gasPrices[fuelGrade] || station.price_per_gallon;
+        const priceSource = (details && details.price_source) || station.price_source;
+        const address = (details && details.address) || station.location?.address || station.address || 'Address not available';
+
+        return `
+            <div style="padding: 10px; min-width: 200px;">
+                <h6><i class="fas fa-gas-pump text-success"></i> ${station.name}</h6>
+                <p class="mb-1"><strong>Price:</strong> $${selectedPrice.toFixed(2)}/gallon${priceSource === 'Estimated' ? ' <small class="text-muted">(estimated)</small>' : ''}</p>
+                <p class="mb-1"><strong>Distance:</strong> ${formatDistance(station.distance_miles)}</p>
+                <p class="mb-1"><strong>Travel Time:</strong> ${formatTime(station.travel_time_minutes)}</p>
+                <p class="mb-0"><strong>Address:</strong> ${address}</p>
+                ${details && details.open_now !== null && details.open_now !== undefined ? `<p class="mb-0"><strong>Open now:</strong> ${details.open_now ? 'Yes' : 'No'}</p>` : ''}
+                ${details && details.phone ? `<p class="mb-0"><strong>Phone:</strong> ${details.phone}</p>` : ''}
+                ${details && details.maps_url ? `<p class="mb-0"><a href="${details.maps_url}" target="_blank" rel="noopener">View on Google Maps</a></p>` : ''}
+                ${isAIRecommended ? '<div class="mt-2"><span class="badge bg-warning text-dark"><i class="fas fa-star"></i> RECOMMENDED</span></div>' : ''}
+            </div>
+        `;
+    }
+
+    loadStationDetails(placeId) {
+        // One request per station per page load; concurrent clicks share it
+        if (!this.stationDetails) {
+            this.stationDetails = new Map();
+        }
+        if (!this.stationDetails.has(placeId)) {
+            const request = fetch(`/api/station/${encodeURIComponent(placeId)}`)
+                .then(response => response.json())
+                .then(result => result.success ? result.station : null)
+                .catch(error => {
+                    console.error('Error loading station details:', error);
+                    this.stationDetails.delete(placeId);
+                    return null;
+                });
+            this.stationDetails.set(placeId, request);
+        }
+        return this.stationDetails.get(placeId);
+    }
+
     async loadConfiguration() {
         try {
             const response = await fetch('/api/config');
             const config = await response.json();
             
+            this.lazyStationDetails = Boolean(config.lazy_station_details);
+
             // Update form with default values
             document.getElementById('mpg').value = config.default_mpg;
             document.getElementById('tankSize').value = config.default_tank_size;
@@ -349,6 +392,14 @@ class GasStationApp {
         try {
             const formData = await this.getFormData();
             
+            // Same place and radius: re-rank the stored results instead of searching again
+            const searchKey = this.getSearchKey(formData);
+            if (this.lastResult?.result_handle && searchKey === this.lastSearchKey) {
+                if (await this.rerankResults(formData)) {
+                    return;
+                }
+            }
+            
             // Show specific status for address geocoding
             if (formData.location_type === 'address') {
                 this.updateStatus('Geocoding address...', 'info');
@@ -365,8 +416,13 @@ class GasStationApp {
             const result = await response.json();
             
             if (result.success) {
+                this.searchJobId = null;
+                this.lastSearchKey = searchKey;
                 this.displayResults(result);
                 this.updateStatus(`Found ${result.filtered_stations} stations within range`, 'success');
+                if (result.analysis_job_id) {
+                    this.streamAnalysis(result);
+                }
             } else {
                 this.updateStatus(`Error: ${result.error}`, 'error');
             }
@@ -377,6 +433,41 @@ class GasStationApp {
         }
     }
 
+    getSearchKey(formData) {
+        // Inputs that change which stations are found (preferences only change the ranking)
+        return JSON.stringify([
+            formData.location_type,
+            formData.address,
+            formData.latitude?.toFixed(4),
+            formData.longitude?.toFixed(4),
+            formData.radius_miles
+        ]);
+    }
+
+    async rerankResults(formData) {
+        // Returns false if the stored results expired and a full search is needed
+        const response = await fetch(`/api/rerank/${this.lastResult.result_handle}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(formData)
+        });
+        if (response.status === 404) {
+            return false;
+        }
+
+        const result = await response.json();
+        if (result.success) {
+            // Keep the current AI analysis; a running analysis is applied to these results when it finishes
+            this.displayResults({ ...result, analysis: this.lastResult.analysis }, false);
+            this.updateStatus(`Found ${result.filtered_stations} stations within range`, 'success');
+        } else {
+            this.updateStatus(`Error: ${result.error}`, 'error');
+        }
+        return true;
+    }
+
     async getFormData() {
         const locationType = document.getElementById('locationType').value;
         const data = {
@@ -424,7 +515,132 @@ class GasStationApp {
         });
     }
 
-    displayResults(result) {
+    streamAnalysis(result) {
+        // Render the AI analysis token by token over Server-Sent Events
+        if (typeof EventSource === 'undefined') {
+            this.pollAnalysis(result);
+            return;
+        }
+
+        const jobId = result.analysis_job_id;
+        this.searchJobId = jobId;
+        this.displayAnalysis(null);
+
+        if (this.analysisStream) {
+            this.analysisStream.close();
+        }
+        const source = new EventSource(`/api/analysis/${jobId}/stream`);
+        this.analysisStream = source;
+        let text = '';
+        let received = false;
+
+        source.addEventListener('chunk', (event) => {
+            if (this.searchJobId !== jobId) {
+                source.close();
+                return;
+            }
+            received = true;
+            text += JSON.parse(event.data).text;
+            this.renderAnalysisChunk(text);
+        });
+
+        source.addEventListener('done', (event) => {
+            source.close();
+            if (this.searchJobId !== jobId) return;
+            const job = JSON.parse(event.data);
+            // Re-rank with the finished analysis
+            this.displayResults({ ...(this.lastResult || result), analysis: job.analysis || job.error || text }, false);
+        });
+
+        source.onerror = () => {
+            source.close();
+            // Fall back to polling if the stream never got going
+            if (!received && this.searchJobId === jobId) {
+                this.pollAnalysis(result);
+            }
+        };
+    }
+
+    renderAnalysisChunk(text) {
+        // Incremental renderer: redraw at most once per animation frame
+        this.pendingAnalysisText = text;
+        if (this.analysisRenderScheduled) return;
+        this.analysisRenderScheduled = true;
+
+        requestAnimationFrame(() => {
+            this.analysisRenderScheduled = false;
+            const analysisText = document.querySelector('#analysisContent .analysis-text');
+            if (analysisText) {
+                analysisText.innerHTML = this.formatMarkdown(this.pendingAnalysisText);
+            } else {
+                this.displayAnalysis(this.pendingAnalysisText);
+            }
+        });
+    }
+
+    async pollAnalysis(result, intervalMs = 1000) {
+        // Fetch the background AI analysis and re-rank once it is ready
+        const jobId = result.analysis_job_id;
+        this.searchJobId = jobId;
+        this.displayAnalysis(null);
+
+        while (this.searchJobId === jobId) {
+            try {
+                const response = await fetch(`/api/analysis/${jobId}`);
+                const job = await response.json();
+
+                if (!job.success) {
+                    this.updateStatus(`AI analysis unavailable: ${job.error}`, 'warning');
+                    return;
+                }
+                if (job.status === 'done' || job.status === 'error') {
+                    if (this.searchJobId !== jobId) return; // A newer search replaced this one
+                    this.displayResults({ ...(this.lastResult || result), analysis: job.analysis || job.error }, false);
+                    return;
+                }
+            } catch (error) {
+                console.error('Error fetching analysis:', error);
+                return;
+            }
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+    }
+
+    displayAnalysis(analysis) {
+        const analysisSection = document.getElementById('analysisSection');
+        const analysisContent = document.getElementById('analysisContent');
+        const body = analysis ? this.formatMarkdown(analysis) : `
+            <div class="text-muted">
+                <span class="spinner-border spinner-border-sm me-2" role="status"></span>
+                AI analysis in progress...
+            </div>
+        `;
+
+        analysisContent.innerHTML = `
+            <div class="analysis-content slide-in">
+                <div class="mb-3">
+                    <i class="fas fa-robot me-2"></i>
+                    <strong>AI Recommendation Analysis:</strong>
+                </div>
+                <div class="analysis-text">
+                    ${body}
+                </div>
+            </div>
+        `;
+        analysisSection.style.display = 'block';
+    }
+
+    withFuelGrade(stations, fuelGrade) {
+        // Use the server's precomputed costs for the selected grade, if present
+        return stations.map(station => {
+            const gradeCosts = station.costs_by_grade && station.costs_by_grade[fuelGrade];
+            return gradeCosts ? { ...station, ...gradeCosts } : station;
+        });
+    }
+
+    displayResults(result, scrollToResults = true) {
+        this.lastResult = result;
+
         // Initialize map if not already done
         if (!this.map) {
             this.initializeMap();
@@ -437,7 +653,7 @@ class GasStationApp {
         const aiRecommendations = this.extractAIRecommendations(result.analysis);
         
         // Sort stations by AI recommendations, cost, and rating
-        let sortedStations = [...result.stations];
+        let sortedStations = this.withFuelGrade(result.stations, document.getElementById('fuelGrade').value);
         sortedStations.sort((a, b) => {
             // First priority: AI recommendations
             const aIsRecommended = aiRecommendations.some(rec => 
@@ -566,7 +782,9 @@ class GasStationApp {
             resultsSection.style.display = 'block';
             
             // Smooth scroll to results (not analysis)
-            this.smoothScrollTo(resultsSection);
+            if (scrollToResults) {
+                this.smoothScrollTo(resultsSection);
+            }
         } else {
             resultsContent.innerHTML = `
                 <div class="text-center text-muted">
@@ -580,21 +798,7 @@ class GasStationApp {
         
         // Display AI analysis (but don't auto-scroll to it)
         if (result.analysis) {
-            const analysisSection = document.getElementById('analysisSection');
-            const analysisContent = document.getElementById('analysisContent');
-            
-            analysisContent.innerHTML = `
-                <div class="analysis-content slide-in">
-                    <div class="mb-3">
-                        <i class="fas fa-robot me-2"></i>
-                        <strong>AI Recommendation Analysis:</strong>
-                    </div>
-                    <div class="analysis-text">
-                        ${this.formatMarkdown(result.analysis)}
-                    </div>
-                </div>
-            `;
-            analysisSection.style.display = 'block';
+            this.displayAnalysis(result.analysis);
         }
     }
 
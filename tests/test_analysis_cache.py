@@ -0,0 +1,32 @@
+"""
+Tests for the LLM analysis cache key
+"""
+
+from services.analysis_cache import analysis_cache_key
+from services.gas_filter import calculate_station_costs
+
+def _stations(distances, fuel_needed=5.0, mpg=25.0):
+    stations = []
+    for index, distance in enumerate(distances):
+        station = {
+            'place_id': f'place-{index}',
+            'name': f'Station {index}',
+            'gas_prices': {'87': 3.49 + index / 10, '89': 3.89, '91': 4.19},
+            'distance_miles': distance
+        }
+        station.update(calculate_station_costs(station, fuel_needed, mpg, '87'))
+        stations.append(station)
+    return stations
+
+def test_small_location_shift_shares_key():
+    here = _stations([1.0, 2.4, 3.7])
+    nearby = _stations([1.1, 2.3, 3.8])
+    assert here[0]['total_cost'] != nearby[0]['total_cost']
+    assert analysis_cache_key(here, '87', 'claude:test', 5.0, 25.0) == \
+        analysis_cache_key(nearby, '87', 'claude:test', 5.0, 25.0)
+
+def test_fuel_needed_and_mpg_change_key():
+    base = analysis_cache_key(_stations([1.0, 2.4]), '87', 'claude:test', 5.0, 25.0)
+    more_fuel = analysis_cache_key(_stations([1.0, 2.4], fuel_needed=12.0), '87', 'claude:test', 12.0, 25.0)
+    thirstier = analysis_cache_key(_stations([1.0, 2.4], mpg=15.0), '87', 'claude:test', 5.0, 15.0)
+    assert len({base, more_fuel, thirstier}) == 3
@@ -0,0 +1,23 @@
+"""
+Tests for station ranking
+"""
+
+from services.gas_filter import rank_by_criteria
+
+def _stations():
+    return [
+        {'place_id': 'a', 'name': 'Unrated', 'rating': None, 'total_cost': 20.0},
+        {'place_id': 'b', 'name': 'Good', 'rating': 4.5, 'total_cost': 21.0},
+        {'place_id': 'c', 'name': 'No rating key', 'total_cost': 19.0},
+        {'place_id': 'd', 'name': 'Fair', 'rating': 3.2, 'total_cost': 22.0}
+    ]
+
+def test_rank_by_rating_handles_missing_ratings():
+    ranked = rank_by_criteria(_stations(), 'rating')
+    assert [station['place_id'] for station in ranked][:2] == ['b', 'd']
+    assert {station['place_id'] for station in ranked[2:]} == {'a', 'c'}
+
+def test_rank_by_rating_top_k_with_none_rating():
+    ranked, rest = rank_by_criteria(_stations(), 'rating', k=2, with_remainder=True)
+    assert [station['place_id'] for station in ranked] == ['b', 'd']
+    assert {station['place_id'] for station in rest} == {'a', 'c'}
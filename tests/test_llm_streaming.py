@@ -0,0 +1,62 @@
+"""
+Tests for streamed LLM analyses and what gets cached
+"""
+
+import json
+from contextlib import contextmanager
+import pytest
+from services.analysis_cache import AnalysisCache
+from services.llm_service import LLMService
+
+STATIONS = [{'place_id': 'a', 'name': 'Station A', 'gas_prices': {'87': 3.59}, 'fuel_cost': 17.95}]
+
+class FakeStreamResponse:
+    def __init__(self, events):
+        self.lines = [f"data: {payload if isinstance(payload, str) else json.dumps(payload)}" for payload in events]
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self.lines)
+
+def _service(monkeypatch, provider, events):
+    service = LLMService()
+    service.claude_api_key = 'test-key' if provider == 'claude' else None
+    service.openai_api_key = 'test-key' if provider == 'openai' else None
+    service.cache = AnalysisCache(cache_dir='')
+
+    @contextmanager
+    def post(*args, **kwargs):
+        yield FakeStreamResponse(events)
+
+    monkeypatch.setattr('services.llm_service.http_client.post', post)
+    return service
+
+def _claude_delta(text):
+    return {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': text}}
+
+def _openai_delta(text, finish_reason=None):
+    return {'choices': [{'delta': {'content': text} if text else {}, 'finish_reason': finish_reason}]}
+
+@pytest.mark.parametrize('provider, events', [
+    ('claude', [_claude_delta('Best: '), _claude_delta('Station A'), {'type': 'message_stop'}]),
+    ('openai', [_openai_delta('Best: '), _openai_delta('Station A'), _openai_delta(None, 'stop'), '[DONE]'])
+])
+def test_complete_stream_is_cached(monkeypatch, provider, events):
+    service = _service(monkeypatch, provider, events)
+    assert ''.join(service.stream_analysis(STATIONS, '87')) == 'Best: Station A'
+    assert service.cache.stats()['size'] == 1
+
+@pytest.mark.parametrize('provider, events', [
+    ('claude', [_claude_delta('Best: '), _claude_delta('Sta')]),
+    ('openai', [_openai_delta('Best: '), _openai_delta('Sta')])
+])
+def test_truncated_stream_raises_and_is_not_cached(monkeypatch, provider, events):
+    service = _service(monkeypatch, provider, events)
+    received = []
+    with pytest.raises(RuntimeError):
+        for chunk in service.stream_analysis(STATIONS, '87'):
+            received.append(chunk)
+    assert ''.join(received) == 'Best: Sta'
+    assert service.cache.stats()['size'] == 0
@@ -0,0 +1,49 @@
+"""
+Tests for the re-rank endpoint
+"""
+
+import json
+import pytest
+import web_app
+from services.result_store import result_store
+
+LOCATION = (37.7749, -122.4194)
+
+def _station(place_id, rating, distance):
+    return {
+        'place_id': place_id,
+        'name': f'Station {place_id}',
+        'brand': 'Shell',
+        'address': '1 Main St',
+        'location': {'latitude': LOCATION[0], 'longitude': LOCATION[1] + distance / 55.0},
+        'distance_miles': distance,
+        'travel_time_minutes': int(distance * 1.5),
+        'price_per_gallon': 3.59,
+        'gas_prices': {'87': 3.59, '89': 3.89, '91': 4.19},
+        'rating': rating
+    }
+
+@pytest.fixture
+def client():
+    return web_app.app.test_client()
+
+@pytest.fixture
+def handle():
+    stations = [_station('a', None, 0.5), _station('b', 4.4, 1.2), _station('c', 3.1, 2.0)]
+    return result_store.put(LOCATION, stations)
+
+@pytest.mark.parametrize('limit', [None, 2])
+def test_rerank_by_rating_with_unrated_station(client, handle, limit):
+    body = {'criteria': 'rating'}
+    if limit:
+        body['limit'] = limit
+    response = client.post(f'/api/rerank/{handle}', json=body)
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert data['success'], data.get('error')
+    assert [station['place_id'] for station in data['stations']][:2] == ['b', 'c']
+
+def test_rerank_rejects_unknown_criteria(client, handle):
+    response = client.post(f'/api/rerank/{handle}', json={'criteria': 'cheapest'})
+    assert response.status_code == 400
+    assert not json.loads(response.data)['success']
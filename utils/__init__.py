@@ -18,6 +18,13 @@ from .helpers import (
     display_warning,
     display_info
 )
+from .concurrency import bounded_map
+from .cache import TTLCache
+from .singleflight import SingleFlight, single_flight
+from .http_client import HTTPClient, http_client
+from .persistent_cache import SQLiteCache
+from .rate_limit import RateLimiter
+from .pagination import encode_cursor, decode_cursor, parse_fields, parse_limit, select_fields, paginate
 
 __all__ = [
     'print_banner',
@@ -33,5 +40,19 @@ __all__ = [
     'display_error',
     'display_success',
     'display_warning',
-    'display_info'
+    'display_info',
+    'bounded_map',
+    'TTLCache',
+    'SQLiteCache',
+    'SingleFlight',
+    'single_flight',
+    'HTTPClient',
+    'http_client',
+    'RateLimiter',
+    'encode_cursor',
+    'decode_cursor',
+    'parse_fields',
+    'parse_limit',
+    'select_fields',
+    'paginate'
 ] 
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+In-memory caching utilities for Gas Station Recommendation App
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """Thread-safe bounded cache with per-entry TTL and LRU eviction"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, stale_ttl: float = 0):
+        """
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            ttl: Seconds an entry stays fresh
+            stale_ttl: Extra seconds an expired entry may still be served as stale
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a fresh value from the cache
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None if missing or expired
+        """
+        value, _ = self.get_with_status(key, allow_stale=False)
+        return value
+
+    def get_with_status(self, key: Hashable, allow_stale: bool = True) -> Tuple[Optional[Any], bool]:
+        """
+        Get a value from the cache along with its staleness
+
+        Args:
+            key: Cache key
+            allow_stale: Serve expired entries that are still inside the stale window
+
+        Returns:
+            Tuple[Optional[Any], bool]: (value, is_stale); value is None on a miss
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            value, expires_at = entry
+            if now < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, False
+
+            if allow_stale and now < expires_at + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return value, True
+
+            if now >= expires_at + self.stale_ttl:
+                del self._entries[key]
+            self.misses += 1
+            return None, False
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value in the cache, evicting the least recently used entries
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Optional TTL override in seconds
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key from the cache if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+
+        Returns:
+            Dict[str, int]: Hit, stale hit, miss and eviction counts plus current size
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() < entry[1]
@@ -0,0 +1,47 @@
+"""
+Concurrency helpers for Gas Station Recommendation App
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+def bounded_map(func: Callable[[T], R], items: Iterable[T], max_workers: int,
+                default: Optional[Any] = None, thread_name_prefix: str = 'worker') -> List[Optional[R]]:
+    """
+    Apply a function to every item using a bounded thread pool
+
+    Results are returned in the same order as the input items. If the call
+    for an item raises, its slot holds ``default`` instead and the other
+    items are unaffected.
+
+    Args:
+        func: Function to call for each item
+        items: Items to process
+        max_workers: Maximum number of concurrent calls
+        default: Value used for items whose call failed
+        thread_name_prefix: Prefix for worker thread names
+
+    Returns:
+        List: One result per item, in input order
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item: T) -> Optional[R]:
+        try:
+            return func(item)
+        except Exception as e:
+            print(f"⚠️  {thread_name_prefix} task failed: {e}")
+            return default
+
+    workers = max(1, min(max_workers, len(items)))
+    if workers == 1:
+        return [call(item) for item in items]
+
+    # A pool per call keeps nested fan-outs from starving each other
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as executor:
+        return list(executor.map(call, items))
@@ -0,0 +1,232 @@
+"""
+Geographic helpers for Gas Station Recommendation App
+"""
+
+import math
+from math import asin, cos, sin, sqrt
+from typing import List, Sequence, Tuple, Union
+import numpy as np
+
+# Earth's radius in miles
+EARTH_RADIUS_MILES = 3956
+
+# Length of one degree of latitude in miles
+MILES_PER_DEGREE_LAT = 2 * math.pi * EARTH_RADIUS_MILES / 360
+
+DEG_TO_RAD = math.pi / 180
+
+Tile = Tuple[int, int]
+Coordinates = Union[Sequence[float], np.ndarray]
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate distance between two points using Haversine formula
+
+    Scalar fast path for single pairs; use haversine_one_to_many or
+    haversine_many_to_many for batches.
+
+    Args:
+        lat1, lon1: First point coordinates
+        lat2, lon2: Second point coordinates
+
+    Returns:
+        float: Distance in miles
+    """
+    lat1 *= DEG_TO_RAD
+    lat2 *= DEG_TO_RAD
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = (lon2 - lon1) * DEG_TO_RAD / 2
+    a = sin(half_dlat)**2 + cos(lat1) * cos(lat2) * sin(half_dlon)**2
+    return 2 * EARTH_RADIUS_MILES * asin(sqrt(a))
+
+def haversine_one_to_many(latitude: float, longitude: float, latitudes: Coordinates,
+                          longitudes: Coordinates) -> np.ndarray:
+    """
+    Distances from one point to many points in a single array operation
+
+    Args:
+        latitude, longitude: Origin point
+        latitudes, longitudes: Destination coordinates (equal length)
+
+    Returns:
+        np.ndarray: Distance in miles to each destination
+    """
+    lat1 = latitude * DEG_TO_RAD
+    lat2 = np.asarray(latitudes, dtype=np.float64) * DEG_TO_RAD
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = (np.asarray(longitudes, dtype=np.float64) - longitude) * (DEG_TO_RAD / 2)
+    a = np.sin(half_dlat)**2 + math.cos(lat1) * np.cos(lat2) * np.sin(half_dlon)**2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def haversine_many_to_many(latitudes1: Coordinates, longitudes1: Coordinates,
+                           latitudes2: Coordinates, longitudes2: Coordinates) -> np.ndarray:
+    """
+    Pairwise distances between two sets of points
+
+    Args:
+        latitudes1, longitudes1: First set of points (n)
+        latitudes2, longitudes2: Second set of points (m)
+
+    Returns:
+        np.ndarray: (n, m) matrix of distances in miles
+    """
+    lat1 = np.asarray(latitudes1, dtype=np.float64)[:, np.newaxis] * DEG_TO_RAD
+    lon1 = np.asarray(longitudes1, dtype=np.float64)[:, np.newaxis]
+    lat2 = np.asarray(latitudes2, dtype=np.float64)[np.newaxis, :] * DEG_TO_RAD
+    lon2 = np.asarray(longitudes2, dtype=np.float64)[np.newaxis, :]
+
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = (lon2 - lon1) * (DEG_TO_RAD / 2)
+    a = np.sin(half_dlat)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(half_dlon)**2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def tile_for(latitude: float, longitude: float, tile_size_deg: float) -> Tile:
+    """
+    Get the fixed-grid tile containing a point
+
+    Args:
+        latitude: Point latitude
+        longitude: Point longitude
+        tile_size_deg: Tile edge length in degrees
+
+    Returns:
+        Tile: (row, column) tile index
+    """
+    return (math.floor(latitude / tile_size_deg), math.floor(longitude / tile_size_deg))
+
+def tile_bounds(tile: Tile, tile_size_deg: float) -> Tuple[float, float, float, float]:
+    """
+    Get the bounding box of a tile
+
+    Returns:
+        Tuple: (south, west, north, east) in degrees
+    """
+    row, col = tile
+    south = row * tile_size_deg
+    west = col * tile_size_deg
+    return (south, west, south + tile_size_deg, west + tile_size_deg)
+
+def tile_center(tile: Tile, tile_size_deg: float) -> Tuple[float, float]:
+    """Get the center point (lat, lng) of a tile"""
+    south, west, north, east = tile_bounds(tile, tile_size_deg)
+    return ((south + north) / 2, (west + east) / 2)
+
+def tile_diagonal_miles(latitude: float, tile_size_deg: float) -> float:
+    """Approximate length of a tile's diagonal in miles at the given latitude"""
+    height = tile_size_deg * MILES_PER_DEGREE_LAT
+    width = height * math.cos(math.radians(latitude))
+    return math.hypot(height, width)
+
+def tiles_intersecting_circle(latitude: float, longitude: float, radius_miles: float,
+                              tile_size_deg: float) -> List[Tile]:
+    """
+    Get every tile that overlaps a circle
+
+    Args:
+        latitude: Circle center latitude
+        longitude: Circle center longitude
+        radius_miles: Circle radius in miles
+        tile_size_deg: Tile edge length in degrees
+
+    Returns:
+        List[Tile]: Tiles with at least one point inside the circle
+    """
+    dlat = radius_miles / MILES_PER_DEGREE_LAT
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    dlng = dlat / cos_lat
+
+    min_row, min_col = tile_for(latitude - dlat, longitude - dlng, tile_size_deg)
+    max_row, max_col = tile_for(latitude + dlat, longitude + dlng, tile_size_deg)
+
+    tiles = []
+    for row in range(min_row, max_row + 1):
+        for col in range(min_col, max_col + 1):
+            south, west, north, east = tile_bounds((row, col), tile_size_deg)
+            # Nearest point of the tile to the circle center
+            nearest_lat = min(max(latitude, south), north)
+            nearest_lng = min(max(longitude, west), east)
+            if haversine_miles(latitude, longitude, nearest_lat, nearest_lng) <= radius_miles:
+                tiles.append((row, col))
+    return tiles
+
+def tile_inside_circle(tile: Tile, tile_size_deg: float, latitude: float, longitude: float,
+                       radius_miles: float) -> bool:
+    """Check whether a tile lies entirely inside a circle"""
+    south, west, north, east = tile_bounds(tile, tile_size_deg)
+    corners = [(south, west), (south, east), (north, west), (north, east)]
+    return all(
+        haversine_miles(latitude, longitude, lat, lng) <= radius_miles
+        for lat, lng in corners
+    )
+
+def hex_cover(latitude: float, longitude: float, radius_miles: float,
+              cell_radius_miles: float) -> List[Tuple[float, float]]:
+    """
+    Centers of overlapping circles that together cover a larger circle
+
+    The centers sit on a hexagonal lattice, which covers the plane with the
+    fewest circles of a given radius. Distances use a local flat-earth
+    projection, which is accurate enough at search-radius scales.
+
+    Args:
+        latitude: Circle center latitude
+        longitude: Circle center longitude
+        radius_miles: Radius of the circle to cover
+        cell_radius_miles: Radius of each covering circle
+
+    Returns:
+        List[Tuple]: (latitude, longitude) centers, nearest to the center first
+    """
+    if cell_radius_miles >= radius_miles:
+        return [(latitude, longitude)]
+
+    miles_per_degree_lng = MILES_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 1e-6)
+    row_step = 1.5 * cell_radius_miles
+    col_step = math.sqrt(3) * cell_radius_miles
+    reach = radius_miles + cell_radius_miles
+    rows = int(math.ceil(reach / row_step))
+    cols = int(math.ceil(reach / col_step)) + 1
+
+    offsets = []
+    for row in range(-rows, rows + 1):
+        shift = col_step / 2 if row % 2 else 0.0
+        for col in range(-cols, cols + 1):
+            x = col * col_step + shift
+            y = row * row_step
+            # Keep every cell whose hexagon (inscribed in its circle) can touch the target circle
+            if math.hypot(x, y) < reach:
+                offsets.append((math.hypot(x, y), y, x))
+    offsets.sort()
+    return [
+        (latitude + y / MILES_PER_DEGREE_LAT, longitude + x / miles_per_degree_lng)
+        for _, y, x in offsets
+    ]
+
+# Seven circles of this fraction of a circle's radius, one in the middle and
+# six on a ring at SPLIT_RING_RATIO, cover it (0.5 is the exact minimum)
+SPLIT_RADIUS_RATIO = 0.55
+SPLIT_RING_RATIO = 0.8
+
+def split_circle(latitude: float, longitude: float, radius_miles: float) -> List[Tuple[float, float]]:
+    """
+    Centers of the seven circles of SPLIT_RADIUS_RATIO * radius that cover a circle
+
+    The ring leaves a margin on both sides: its circles reach past the
+    boundary between them and close the gaps around the middle circle.
+
+    Args:
+        latitude: Circle center latitude
+        longitude: Circle center longitude
+        radius_miles: Radius of the circle to cover
+
+    Returns:
+        List[Tuple]: (latitude, longitude) centers, the middle one first
+    """
+    miles_per_degree_lng = MILES_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 1e-6)
+    ring = SPLIT_RING_RATIO * radius_miles
+    centers = [(latitude, longitude)]
+    for step in range(6):
+        angle = math.pi / 3 * step
+        centers.append((latitude + ring * math.sin(angle) / MILES_PER_DEGREE_LAT,
+                        longitude + ring * math.cos(angle) / miles_per_degree_lng))
+    return centers
@@ -0,0 +1,106 @@
+"""
+Shared HTTP client for Gas Station Recommendation App
+"""
+
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+# Only idempotent requests are retried
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class HTTPClient:
+    """Keep-alive HTTP sessions shared by all services, one per host"""
+
+    def __init__(self, pool_size: Optional[int] = None, timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None, backoff_factor: Optional[float] = None):
+        """
+        Args:
+            pool_size: Maximum pooled connections per host
+            timeout: Default request timeout in seconds
+            max_retries: Retries for idempotent requests
+            backoff_factor: Exponential backoff factor between retries
+        """
+        self.pool_size = pool_size or Config.HTTP_POOL_SIZE
+        self.timeout = timeout or Config.HTTP_TIMEOUT_SECONDS
+        self.max_retries = Config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = Config.HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        Get the pooled session for a URL's host
+
+        Args:
+            url: Request URL
+
+        Returns:
+            requests.Session: Session with a keep-alive connection pool for the host
+        """
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def _create_session(self) -> requests.Session:
+        """Create a session with a sized connection pool and retry policy"""
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the host's pooled session
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to requests (a default timeout is applied)
+
+        Returns:
+            requests.Response: The response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request (retried with backoff on failure)"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request (never retried)"""
+        return self.request('POST', url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled sessions"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+# Shared instance used by all services
+http_client = HTTPClient()
@@ -0,0 +1,114 @@
+"""
+Pagination and sparse fieldset helpers for Gas Station Recommendation App
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """
+    Encode pagination state as an opaque, URL-safe cursor
+
+    Args:
+        state: JSON-serializable state needed to fetch the next page
+
+    Returns:
+        str: Cursor string
+    """
+    payload = json.dumps(state, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).rstrip(b'=').decode('ascii')
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Dict: Pagination state
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(state, dict):
+        raise ValueError('Invalid cursor')
+    return state
+
+def parse_limit(value: Any, maximum: int) -> Optional[int]:
+    """
+    Parse a page size
+
+    Args:
+        value: Requested limit (None or empty for no limit)
+        maximum: Largest page size allowed
+
+    Returns:
+        Optional[int]: Page size, or None for everything
+
+    Raises:
+        ValueError: If the limit is not a positive integer
+    """
+    if value is None or value == '':
+        return None
+    limit = int(value)
+    if limit <= 0:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, maximum)
+
+def parse_fields(value: Union[None, str, Sequence[str]]) -> Optional[List[str]]:
+    """
+    Parse a sparse fieldset such as "name,total_cost,location"
+
+    Args:
+        value: Comma-separated string or list of field names
+
+    Returns:
+        Optional[List[str]]: Field names, or None for all fields
+    """
+    if not value:
+        return None
+    names = value.split(',') if isinstance(value, str) else value
+    fields = [name.strip() for name in names if name and name.strip()]
+    return fields or None
+
+def select_fields(items: List[Dict[str, Any]], fields: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    """
+    Project items onto a sparse fieldset
+
+    Args:
+        items: Dicts to project
+        fields: Top-level keys to keep (None keeps everything)
+
+    Returns:
+        List[Dict]: Items holding only the requested keys that exist
+    """
+    if fields is None:
+        return items
+    return [{name: item[name] for name in fields if name in item} for item in items]
+
+def paginate(items: List[Any], offset: int, limit: Optional[int],
+             total: Optional[int] = None) -> Tuple[List[Any], Optional[int]]:
+    """
+    Slice one page out of a list
+
+    Args:
+        items: Items in order (may stop early, at offset + limit)
+        offset: Index of the first item of the page
+        limit: Page size (None for everything from offset)
+        total: Total number of items, if items is only a prefix
+
+    Returns:
+        Tuple: (page items, offset of the next page or None if this is the last)
+    """
+    total = len(items) if total is None else total
+    if limit is None:
+        return items[offset:], None
+    end = offset + limit
+    return items[offset:end], (end if end < total else None)
@@ -0,0 +1,161 @@
+"""
+Persistent caching utilities for Gas Station Recommendation App
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Value stored for a negatively cached key (a lookup known to have failed)
+_MISSING = 'null'
+
+class SQLiteCache:
+    """
+    Key/value cache in a SQLite database shared by every worker process
+
+    The database runs in WAL mode so readers in one process never block on
+    a writer in another. Entries carry their own expiry, failures can be
+    cached under a shorter negative TTL, and the table is trimmed back to
+    max_entries by least recent use. Values must be JSON-serializable.
+    Several caches can share one file by using different tables.
+    """
+
+    # Rows beyond max_entries tolerated before a trim, and how often to count
+    TRIM_SLACK = 0.1
+    TRIM_EVERY_WRITES = 64
+
+    # Last-use times closer than this are not rewritten on every hit
+    TOUCH_RESOLUTION_SECONDS = 60
+
+    def __init__(self, path: str, table: str = 'cache', max_entries: int = 100000,
+                 ttl: float = 86400, negative_ttl: float = 600):
+        """
+        Args:
+            path: Database file (':memory:' for a private in-memory database)
+            table: Table holding this cache's entries
+            max_entries: Entries kept before least recently used ones are dropped
+            ttl: Seconds an entry stays valid
+            negative_ttl: Seconds a cached failure stays valid
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        if self.path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)'
+        )
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_used_at ON {self.table} (used_at)')
+        return conn
+
+    def lookup(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """
+        Look up a key
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple[bool, Optional[Any]]: (found, value). A negatively cached key
+            is found with value None; a miss or expired entry is (False, None).
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    f'SELECT value, expires_at, used_at FROM {self.table} WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None or row[1] <= now:
+                    self.misses += 1
+                    return False, None
+
+                value, _, used_at = row
+                if now - used_at >= self.TOUCH_RESOLUTION_SECONDS:
+                    self._conn.execute(f'UPDATE {self.table} SET used_at = ? WHERE key = ?', (now, key))
+                if value == _MISSING:
+                    self.negative_hits += 1
+                    return True, None
+                self.hits += 1
+        except sqlite3.Error as e:
+            print(f"⚠️  Cache read error ({self.table}): {e}")
+            return False, None
+        return True, json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value (not None)
+            ttl: Override the default TTL for this entry
+        """
+        self._write(key, json.dumps(value, separators=(',', ':')), self.ttl if ttl is None else ttl)
+
+    def set_missing(self, key: str) -> None:
+        """Cache a failed lookup for the negative TTL"""
+        self._write(key, _MISSING, self.negative_ttl)
+
+    def _write(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)',
+                    (key, value, now + ttl, now)
+                )
+                self._writes += 1
+                if self._writes % self.TRIM_EVERY_WRITES == 0:
+                    self._trim(now)
+        except sqlite3.Error as e:
+            print(f"⚠️  Cache write error ({self.table}): {e}")
+
+    def _trim(self, now: float) -> None:
+        """Drop expired rows, then least recently used rows over the size cap (lock held)"""
+        self._conn.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (now,))
+        count = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        if count <= self.max_entries * (1 + self.TRIM_SLACK):
+            return
+        excess = count - self.max_entries
+        self._conn.execute(
+            f'DELETE FROM {self.table} WHERE key IN '
+            f'(SELECT key FROM {self.table} ORDER BY used_at LIMIT ?)', (excess,)
+        )
+        self.evictions += excess
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters for this process and the shared entry count"""
+        try:
+            with self._lock:
+                entries = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        except sqlite3.Error:
+            entries = -1
+        return {
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries
+        }
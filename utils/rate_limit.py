@@ -0,0 +1,48 @@
+"""
+Rate limiting for Gas Station Recommendation App
+"""
+
+import threading
+import time
+from typing import Optional
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls at least 1/rate seconds apart
+
+    Callers reserve the next free slot and sleep until it arrives, so
+    concurrent callers are served in the order they asked and the upstream
+    never sees a burst.
+    """
+
+    def __init__(self, rate_per_second: float):
+        """
+        Args:
+            rate_per_second: Maximum sustained calls per second
+        """
+        self.interval = 1.0 / rate_per_second
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a call slot
+
+        Args:
+            timeout: Longest time to wait in seconds (None waits as long as needed)
+
+        Returns:
+            bool: True if a slot was taken, False if it would not arrive in time
+                (no slot is consumed then)
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            wait = slot - now
+            if timeout is not None and wait > timeout:
+                return False
+            self._next_slot = slot + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
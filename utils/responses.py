@@ -0,0 +1,112 @@
+"""
+API response encoding for Gas Station Recommendation App
+
+Replaces Flask's jsonify with an encoder that:
+- uses orjson when installed (falls back to the standard library),
+- answers MessagePack when the client asks for application/msgpack and
+  msgpack is installed,
+- compresses bodies above a size threshold with brotli (if installed) or
+  gzip, as negotiated through Accept-Encoding,
+- sets ETags on cacheable responses and answers If-None-Match with 304.
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Any, Optional, Tuple
+from flask import Response, request
+from config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Serialize a payload to JSON bytes with the fastest available backend
+
+    Args:
+        payload: JSON-serializable data
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # Types orjson doesn't know; let the standard encoder try
+    return json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+
+def _negotiate_mimetype() -> str:
+    if msgpack is None:
+        return JSON_MIMETYPE
+    best = request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE, 'application/x-msgpack'])
+    return MSGPACK_MIMETYPE if best in (MSGPACK_MIMETYPE, 'application/x-msgpack') else JSON_MIMETYPE
+
+def _encode(payload: Any, mimetype: str) -> bytes:
+    if mimetype == MSGPACK_MIMETYPE:
+        return msgpack.packb(payload, use_bin_type=True, default=str)
+    return encode_json(payload)
+
+def _compress(body: bytes) -> Tuple[bytes, Optional[str]]:
+    """Compress a body with the best encoding the client accepts"""
+    if len(body) < Config.RESPONSE_COMPRESS_MIN_BYTES:
+        return body, None
+    encodings = request.accept_encodings
+    if brotli is not None and encodings['br']:
+        return brotli.compress(body, quality=Config.RESPONSE_BROTLI_QUALITY), 'br'
+    if encodings['gzip']:
+        return gzip.compress(body, compresslevel=Config.RESPONSE_GZIP_LEVEL), 'gzip'
+    return body, None
+
+def api_response(payload: Any, status: int = 200, cacheable: bool = False) -> Response:
+    """
+    Build an API response
+
+    Args:
+        payload: Response data
+        status: HTTP status code
+        cacheable: Set an ETag and answer matching If-None-Match with 304
+
+    Returns:
+        Response: Encoded (and possibly compressed) response
+    """
+    mimetype = _negotiate_mimetype()
+    body = _encode(payload, mimetype)
+
+    etag = None
+    if cacheable and status == 200:
+        etag = hashlib.blake2b(mimetype.encode('ascii') + body, digest_size=16).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.update(('Accept', 'Accept-Encoding'))
+            return response
+
+    body, content_encoding = _compress(body)
+    response = Response(body, status=status, mimetype=mimetype)
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    response.vary.update(('Accept', 'Accept-Encoding'))
+
+    if etag:
+        # Weak, because the same entity is served with different content codings
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
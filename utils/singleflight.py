@@ -0,0 +1,74 @@
+"""
+Request coalescing for Gas Station Recommendation App
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    """An in-flight call whose result is shared with waiting callers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait and receive the same result (or exception) instead
+    of repeating the work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run func once per key among concurrent callers
+
+        Args:
+            key: Identity of the work; callers with equal keys are coalesced
+            func: Function to call
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            Any: Result of the (possibly shared) call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being worked on"""
+        with self._lock:
+            return len(self._calls)
+
+# Shared instance used by all services
+single_flight = SingleFlight()
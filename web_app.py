@@ -3,12 +3,16 @@
 Flask Web Application for Gas Station Recommendation App
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, session, stream_with_context
 import json
 import os
 from datetime import datetime
-from services import fuel_calculator, location_service, map_service, gas_filter, llm_service
+from services import fuel_calculator, location_service, map_service, gas_filter
+from services.analysis_jobs import analysis_jobs
+from services.result_store import result_store
 from models.schema import UserPreferences
+from utils.pagination import decode_cursor, encode_cursor, paginate, parse_fields, parse_limit, select_fields
+from utils.responses import api_response
 from config import Config
 
 app = Flask(__name__)
@@ -30,13 +34,44 @@ def calculate_fuel():
         
         fuel_needed = fuel_calculator.calculate_gas_needed(input_type, value, tank_size)
         
-        return jsonify({
+        return api_response({
             'success': True,
             'fuel_needed': fuel_needed,
             'tank_remaining': tank_size - fuel_needed
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return api_response({'success': False, 'error': str(e)})
+
+def _rank_stations(stations, params, top_k=None):
+    """
+    Filter and rank stations with a set of user preferences
+    
+    Returns the ranked stations (only the first top_k if set) and the
+    number of stations that passed the filter.
+    """
+    tank_remaining = max(0, params['tank_size'] - params['fuel_needed'])  # Ensure non-negative
+    args = (stations, params['fuel_needed'], params['mpg'], tank_remaining)
+    
+    if params.get('criteria'):
+        filtered = gas_filter.filter_stations(*args, fuel_grade=params['fuel_grade'])
+        return gas_filter.rank_by_criteria(filtered, params['criteria'], k=top_k), len(filtered)
+    
+    ranked, rest = gas_filter.filter_stations(*args, fuel_grade=params['fuel_grade'], top_k=top_k, with_remainder=True)
+    return ranked, len(ranked) + len(rest)
+
+def _station_page(stations, handle, params, offset, limit, fields, total=None):
+    """Cut a page of ranked stations and build the cursor for the next one"""
+    page, next_offset = paginate(stations, offset, limit, total)
+    next_cursor = None
+    if next_offset is not None:
+        next_cursor = encode_cursor({
+            'handle': handle,
+            'offset': next_offset,
+            'limit': limit,
+            'fields': fields,
+            'params': params
+        })
+    return select_fields(page, fields), next_cursor
 
 @app.route('/api/search-stations', methods=['POST'])
 def search_stations():
@@ -50,9 +85,13 @@ def search_stations():
         fuel_needed = float(data.get('fuel_needed', 5.0))
         fuel_grade = data.get('fuel_grade', '87')  # Default to regular (87)
         
+        # Optional paging and sparse fieldset, e.g. limit=20, fields="name,total_cost,location"
+        limit = parse_limit(data.get('limit'), Config.MAX_PAGE_SIZE)
+        fields = parse_fields(data.get('fields'))
+        
         # Validate inputs
         if not all([mpg, tank_size, fuel_needed]):
-            return jsonify({
+            return api_response({
                 'success': False, 
                 'error': 'Invalid input values. Please check MPG, tank size, and fuel needed.'
             })
@@ -82,35 +121,183 @@ def search_stations():
                     raise Exception("Invalid location returned")
                     
             except Exception as e:
-                return jsonify({
+                return api_response({
                     'success': False, 
                     'error': f'Could not find location for address: {address}. Please check the address or use current location.'
                 })
         
         # Search for stations
         radius_miles = float(data.get('radius_miles', 10.0))
-        stations = map_service.search_gas_stations(location, radius_miles)
+        params = {'mpg': mpg, 'tank_size': tank_size, 'fuel_needed': fuel_needed, 'fuel_grade': fuel_grade}
+        if data.get('adaptive', Config.ADAPTIVE_SEARCH):
+            # Start small and widen only until enough stations pass the filters
+            target = int(data.get('target_stations', Config.ADAPTIVE_TARGET_STATIONS))
+            stations, radius_miles = map_service.search_gas_stations_adaptive(
+                location, radius_miles,
+                lambda found: len(_rank_stations(found, params, top_k=target)[0]) >= target
+            )
+        else:
+            stations = map_service.search_gas_stations(location, radius_miles)
+        
+        # Keep the raw results so new preferences can be applied without searching again
+        result_handle = result_store.put(location, stations)
         
         # Filter stations
-        tank_remaining = max(0, tank_size - fuel_needed)  # Ensure non-negative
-        filtered_stations = gas_filter.filter_stations(stations, fuel_needed, mpg, tank_remaining, fuel_grade=fuel_grade)
+        filtered_stations, _ = _rank_stations(stations, params)
         
-        # Get AI analysis
+        # Queue AI analysis in the background so stations return right away
+        analysis_job_id = None
         if filtered_stations:
-            analysis = llm_service.analyze_with_llm(filtered_stations[:10], fuel_grade)  # Pass fuel grade
+            job = analysis_jobs.submit(filtered_stations[:10], fuel_grade, fuel_needed, mpg)  # Pass fuel grade
+            analysis_job_id = job.job_id
+            analysis = None
+            if not data.get('async_analysis', True):
+                # Legacy clients wait for the analysis in the same response; if it
+                # runs long they get the job id to poll instead
+                if job.wait(timeout=Config.ANALYSIS_SYNC_WAIT_SECONDS):
+                    analysis = job.analysis or job.error
         else:
             analysis = "No gas stations found within your range."
         
-        return jsonify({
+        page, next_cursor = _station_page(filtered_stations, result_handle, params, 0, limit, fields)
+        return api_response({
             'success': True,
             'location': location,
-            'stations': filtered_stations,
+            'stations': page,
+            'next_cursor': next_cursor,
             'analysis': analysis,
+            'analysis_job_id': analysis_job_id,
+            'result_handle': result_handle,
+            'radius_miles': radius_miles,
             'total_stations': len(stations),
             'filtered_stations': len(filtered_stations)
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return api_response({'success': False, 'error': str(e)})
+
+@app.route('/api/rerank/<handle>', methods=['POST'])
+def rerank_stations(handle):
+    """Re-filter and re-rank a stored search result with new preferences"""
+    try:
+        data = request.get_json() or {}
+        
+        params = {
+            'mpg': float(data.get('mpg', 25.0)),
+            'tank_size': float(data.get('tank_size', 15.0)),
+            'fuel_needed': float(data.get('fuel_needed', 5.0)),
+            'fuel_grade': data.get('fuel_grade', '87'),
+            'criteria': data.get('criteria')  # None keeps the efficiency ranking
+        }
+        limit = parse_limit(data.get('limit'), Config.MAX_PAGE_SIZE)
+        fields = parse_fields(data.get('fields'))
+        
+        if not all([params['mpg'], params['tank_size'], params['fuel_needed']]):
+            return api_response({
+                'success': False, 
+                'error': 'Invalid input values. Please check MPG, tank size, and fuel needed.'
+            })
+        if params['criteria'] is not None and params['criteria'] not in gas_filter.RANKING_CRITERIA:
+            return api_response({
+                'success': False,
+                'error': f"Unknown criteria: {params['criteria']}. Use one of {', '.join(gas_filter.RANKING_CRITERIA)}."
+            }, 400)
+        
+        stored = result_store.get(handle)
+        if stored is None:
+            return api_response({'success': False, 'error': 'Search results expired. Please search again.'}, 404)
+        location, stations = stored
+        
+        ranked, filtered_count = _rank_stations(stations, params, top_k=limit)
+        page, next_cursor = _station_page(ranked, handle, params, 0, limit, fields, filtered_count)
+        
+        return api_response({
+            'success': True,
+            'location': location,
+            'stations': page,
+            'next_cursor': next_cursor,
+            'analysis': None,
+            'analysis_job_id': None,
+            'result_handle': handle,
+            'total_stations': len(stations),
+            'filtered_stations': filtered_count
+        })
+    except Exception as e:
+        return api_response({'success': False, 'error': str(e)})
+
+@app.route('/api/results', methods=['GET'])
+def get_result_page():
+    """Get the next page of a search or re-rank, given its cursor"""
+    try:
+        state = decode_cursor(request.args.get('cursor', ''))
+        offset = int(state['offset'])
+        limit = parse_limit(request.args.get('limit', state.get('limit')), Config.MAX_PAGE_SIZE)
+        fields = parse_fields(request.args.get('fields')) or state.get('fields')
+        params = state['params']
+    except (KeyError, TypeError, ValueError) as e:
+        return api_response({'success': False, 'error': f'Invalid cursor or paging parameters: {e}'}, 400)
+    
+    try:
+        stored = result_store.get(state['handle'])
+        if stored is None:
+            return api_response({'success': False, 'error': 'Search results expired. Please search again.'}, 404)
+        location, stations = stored
+        
+        top_k = None if limit is None else offset + limit
+        ranked, filtered_count = _rank_stations(stations, params, top_k=top_k)
+        page, next_cursor = _station_page(ranked, state['handle'], params, offset, limit, fields, filtered_count)
+        
+        return api_response({
+            'success': True,
+            'location': location,
+            'stations': page,
+            'next_cursor': next_cursor,
+            'result_handle': state['handle'],
+            'total_stations': len(stations),
+            'filtered_stations': filtered_count
+        }, cacheable=True)  # A cursor always names the same page
+    except Exception as e:
+        return api_response({'success': False, 'error': str(e)})
+
+@app.route('/api/station/<place_id>', methods=['GET'])
+def get_station_details(place_id):
+    """Get full details and a fresh price for one station"""
+    try:
+        details = map_service.get_station_details(place_id)
+        if details is None:
+            return api_response({'success': False, 'error': 'Station details not available'}, 404)
+        return api_response({'success': True, 'station': details})
+    except Exception as e:
+        return api_response({'success': False, 'error': str(e)})
+
+@app.route('/api/analysis/<job_id>', methods=['GET'])
+def get_analysis(job_id):
+    """Get the status and result of a background AI analysis"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return api_response({'success': False, 'error': 'Analysis not found or expired'}, 404)
+    
+    return api_response({'success': True, **job.to_dict()}, cacheable=job.is_finished)
+
+@app.route('/api/analysis/<job_id>/stream', methods=['GET'])
+def stream_analysis(job_id):
+    """Stream a background AI analysis to the browser as Server-Sent Events"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return api_response({'success': False, 'error': 'Analysis not found or expired'}, 404)
+    
+    def events():
+        for chunk in job.iter_chunks(heartbeat=15):
+            if chunk is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: chunk\ndata: {json.dumps({'text': chunk})}\n\n"
+        yield f"event: done\ndata: {json.dumps(job.to_dict())}\n\n"
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/geocode', methods=['POST'])
 def geocode_address():
@@ -120,17 +307,17 @@ def geocode_address():
         address = data.get('address')
         
         if not address:
-            return jsonify({'success': False, 'error': 'Address is required'})
+            return api_response({'success': False, 'error': 'Address is required'})
         
         location = location_service.geocode_address(address)
         
-        return jsonify({
+        return api_response({
             'success': True,
             'latitude': location[0],
             'longitude': location[1]
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return api_response({'success': False, 'error': str(e)})
 
 @app.route('/api/current-location', methods=['GET'])
 def get_current_location():
@@ -138,31 +325,32 @@ def get_current_location():
     try:
         location = location_service.get_location_from_ip()
         
-        return jsonify({
+        return api_response({
             'success': True,
             'latitude': location[0],
             'longitude': location[1]
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return api_response({'success': False, 'error': str(e)})
 
 @app.route('/api/config')
 def get_config():
     """Get app configuration"""
-    return jsonify({
+    return api_response({
         'default_mpg': Config.DEFAULT_MPG,
         'default_tank_size': Config.DEFAULT_TANK_SIZE,
         'default_radius': Config.DEFAULT_SEARCH_RADIUS_MILES,
         'max_travel_time': Config.MAX_TRAVEL_TIME_MINUTES,
         'has_google_maps': bool(Config.GOOGLE_MAPS_API_KEY),
         'has_claude': bool(Config.CLAUDE_API_KEY),
-        'has_openai': bool(Config.OPENAI_API_KEY)
-    })
+        'has_openai': bool(Config.OPENAI_API_KEY),
+        'lazy_station_details': Config.LAZY_STATION_DETAILS
+    }, cacheable=True)
 
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return api_response({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'version': '1.0.0'